@@ -16,20 +16,60 @@ import re
 import cv2
 import numpy as np
 import pytesseract
-import pandas as pd
 from tqdm import tqdm
 import argparse
+import csv
+import concurrent.futures
+import itertools
 import sys
 import platform
 import base64
 import json
-import requests  # For Ollama
 
-# Optional for OpenAI
+# Optional: orjson parses AI responses several times faster than stdlib json
 try:
-    from openai import OpenAI as OpenAIClient
+    import orjson
+    json_loads = orjson.loads
 except ImportError:
-    OpenAIClient = None
+    json_loads = json.loads
+
+# Optional: in-process Tesseract via tesserocr (no subprocess + model load per call)
+try:
+    import tesserocr
+    from PIL import Image
+except ImportError:
+    tesserocr = None
+
+TESSERACT_CONFIG = '--psm 6 --oem 3'  # pytesseract fallback; matches the tesserocr API below
+_tess_api = None
+
+def get_tess_api():
+    # One API (and loaded LSTM model) per worker process
+    global _tess_api
+    if _tess_api is None:
+        _tess_api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_BLOCK, oem=tesserocr.OEM.DEFAULT)
+    return _tess_api
+
+# ----------------------------- AI CLIENTS (reused per process) -----------------------------
+# Imported on first AI call, so Tesseract-only runs and --help skip requests/openai
+_http = None
+_openai_client = None
+
+def get_http_session():
+    # One pooled HTTP session keeps the Ollama connection alive across files
+    global _http
+    if _http is None:
+        import requests
+        _http = requests.Session()
+    return _http
+
+def get_openai_client():
+    # Raises ImportError if the optional openai package is missing
+    global _openai_client
+    if _openai_client is None:
+        from openai import OpenAI as OpenAIClient
+        _openai_client = OpenAIClient()
+    return _openai_client
 
 # ----------------------------- AUTO TESSERACT PATH (Windows) -----------------------------
 if platform.system() == "Windows":
@@ -59,6 +99,28 @@ def print_banner():
     print("\033[1;36m😺 Meowzon Order OCR Extractor v2.0 - AI Hybrid Edition 😺\033[0m")
     print("\033[90mUltimate extraction with Tesseract + optional AI vision models!\033[0m\n")
 
+# ----------------------------- PATTERNS -----------------------------
+_ORDER_RE = re.compile(r'\d{3}-\d{7}-\d{7}')
+_PRICE_RE = re.compile(r'\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?')
+_DATE_RE = re.compile(r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}')
+_TOTAL_RE = re.compile(r'(?:Order Total|Grand Total|Total)[\s:]*(\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', re.IGNORECASE)
+_QTY_RE = re.compile(r'(?:Qty|Quantity)[\.:]?\s*(\d+)', re.IGNORECASE)
+_SELLER_RE = re.compile(r'Sold by[:\s]*(.+?)(?:\n|$)')
+_CLEAN_RE = re.compile(r'\$[\d,]+\.?\d*|\d{3}-\d{7}.*')
+_EXCLUDE_RE = re.compile(r'total|shipping|tax|qty|sold by', re.IGNORECASE)
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# ----------------------------- CSV COLUMNS -----------------------------
+CSV_FIELDS = [
+    "File Name", "Status", "AI Used", "AI Provider", "Tesseract Confidence (%)",
+    "Crop Used", "Cropped Image", "Processed Image", "Order IDs", "Prices",
+    "Dates", "Totals", "Quantities", "Sellers", "Items", "Raw Tesseract Snippet",
+]
+
+def as_csv_row(row):
+    # Fixed-order tuple: no column names to pickle back from workers or look up per write
+    return tuple(row.get(field, "") for field in CSV_FIELDS)
+
 # ----------------------------- CROPPING STRATEGIES -----------------------------
 additional_crops = [
     {"name": "No Bottom 20%", "top": 0.0, "bottom": 0.2, "left": 0.0, "right": 0.0},
@@ -68,26 +130,69 @@ additional_crops = [
     {"name": "Tight Center", "top": 0.1, "bottom": 0.1, "left": 0.05, "right": 0.05},
 ]
 
+# Crop margins as one (top, bottom, left, right) table, scaled per image in one step
+_CROP_FRACTIONS = np.array([[c["top"], c["bottom"], c["left"], c["right"]] for c in additional_crops])
+# Try the tightest crops (most area removed) first so the early exit triggers sooner
+_CROP_ORDER = np.argsort(
+    (1 - _CROP_FRACTIONS[:, 0] - _CROP_FRACTIONS[:, 1]) * (1 - _CROP_FRACTIONS[:, 2] - _CROP_FRACTIONS[:, 3]),
+    kind='stable'
+)
+
 # ----------------------------- PREPROCESS FOR TESSERACT -----------------------------
-def preprocess_for_tesseract(color_img):
-    gray = cv2.cvtColor(color_img, cv2.COLOR_BGR2GRAY)
-    gray = cv2.medianBlur(gray, 3)
-    gray = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-    thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15)
-    inv_thresh = cv2.bitwise_not(thresh)
-    config = '--psm 6 --oem 3'
+def preprocess_for_tesseract(color_img, _scratch=None):
+    # Reuse grayscale/blur buffers across crops of the same shape
+    if _scratch is None:
+        _scratch = {}
+    shape = color_img.shape[:2]
+    gray = cv2.cvtColor(color_img, cv2.COLOR_BGR2GRAY, dst=_scratch.get(('gray', shape)))
+    _scratch[('gray', shape)] = gray
+    gray = cv2.medianBlur(gray, 3, dst=_scratch.get(('blur', shape)))
+    _scratch[('blur', shape)] = gray
+    # Scale the long edge towards ~1600 px (at most 2x) instead of always doubling
+    h, w = gray.shape
+    scale = min(1600 / max(h, w), 2.0)
+    if abs(scale - 1.0) > 0.05:
+        interp = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interp)
+    # Threshold window tracks the scale (31 px at the old fixed 2x)
+    block_size = max(3, int(round(31 * scale / 2)) | 1)
+    thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block_size, 15)
 
     def ocr_with_conf(image):
+        if tesserocr is not None:
+            try:
+                api = get_tess_api()
+                api.SetImage(Image.fromarray(image))
+                return api.GetUTF8Text().strip(), float(api.MeanTextConf())
+            except Exception:
+                return "", 0.0
+
+        # One image_to_data pass gives both the words and their confidences
         try:
-            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, config=config)
-            confs = [int(c) for c in data['conf'] if c != '-1']
-            mean_conf = np.mean(confs) if confs else 0
-            text = pytesseract.image_to_string(image, config=config)
-            return text.strip(), mean_conf
+            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, config=TESSERACT_CONFIG)
         except:
             return "", 0.0
+        confs = []
+        lines = {}
+        for word, c, block, par, line in zip(data['text'], data['conf'], data['block_num'],
+                                             data['par_num'], data['line_num']):
+            c = float(c)
+            if c == -1:
+                continue
+            confs.append(c)
+            if word.strip():
+                lines.setdefault((block, par, line), []).append(word)
+        mean_conf = np.mean(confs) if confs else 0
+        text = "\n".join(" ".join(words) for words in lines.values())
+        return text.strip(), mean_conf
 
     text_normal, conf_normal = ocr_with_conf(thresh)
+
+    # Only try the inverted image when the normal one reads poorly
+    if conf_normal >= 60:
+        return text_normal, conf_normal, thresh
+
+    inv_thresh = cv2.bitwise_not(thresh)
     text_inv, conf_inv = ocr_with_conf(inv_thresh)
 
     if conf_normal >= conf_inv:
@@ -96,13 +201,24 @@ def preprocess_for_tesseract(color_img):
         return text_inv, conf_inv, inv_thresh
 
 # ----------------------------- TRIAL CROPPING (returns best color + processed) -----------------------------
+def load_image(file_path):
+    # imdecode on raw bytes also handles non-ASCII paths on Windows
+    try:
+        data = np.fromfile(file_path, dtype=np.uint8)
+    except OSError:
+        return None
+    if data.size == 0:
+        return None
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
 def get_best_image(file_path):
-    img = cv2.imread(file_path)
+    img = load_image(file_path)
     if img is None:
         return None, "", 0.0, "Failed", "Full Image", None
+    scratch = {}
 
     # Full image first
-    text, conf, proc_img = preprocess_for_tesseract(img)
+    text, conf, proc_img = preprocess_for_tesseract(img, scratch)
     crop_name = "Full Image"
     best_color = img
     best_proc = proc_img
@@ -110,19 +226,25 @@ def get_best_image(file_path):
     best_text = text
     best_crop_params = None
 
-    score = conf + 100 if re.search(r'\d{3}-\d{7}-\d{7}', text) else 0
+    score = conf + 100 if _ORDER_RE.search(text) else 0
+
+    # Confident order-ID read on the full image: no crop can do meaningfully better
+    if score and conf >= 80:
+        return best_color, best_text, best_conf, crop_name, best_proc, best_crop_params
 
-    for crop_dict in additional_crops:
-        h, w = img.shape[:2]
-        start_y = int(h * crop_dict["top"])
-        end_y = h - int(h * crop_dict["bottom"])
-        start_x = int(w * crop_dict["left"])
-        end_x = w - int(w * crop_dict["right"])
-        if end_y <= start_y or end_x <= start_x:
-            continue
+    # Pixel bounds for every crop at once; drop degenerate boxes
+    h, w = img.shape[:2]
+    bounds = (_CROP_FRACTIONS * (h, h, w, w)).astype(np.int64)
+    bounds[:, 1] = h - bounds[:, 1]
+    bounds[:, 3] = w - bounds[:, 3]
+    valid = (bounds[:, 1] > bounds[:, 0]) & (bounds[:, 3] > bounds[:, 2])
+
+    for i in _CROP_ORDER[valid[_CROP_ORDER]]:
+        crop_dict = additional_crops[i]
+        start_y, end_y, start_x, end_x = bounds[i]
         cropped = img[start_y:end_y, start_x:end_x]
-        t_text, t_conf, t_proc = preprocess_for_tesseract(cropped)
-        t_score = t_conf + 100 if re.search(r'\d{3}-\d{7}-\d{7}', t_text) else 0
+        t_text, t_conf, t_proc = preprocess_for_tesseract(cropped, scratch)
+        t_score = t_conf + 100 if _ORDER_RE.search(t_text) else 0
         if t_score > score:
             score = t_score
             best_text = t_text
@@ -131,30 +253,39 @@ def get_best_image(file_path):
             best_proc = t_proc
             crop_name = crop_dict["name"]
             best_crop_params = crop_dict
+            # Clearly better than the full image and confident: stop trying crops
+            if t_score >= conf + 100 and t_conf >= 85:
+                break
 
     return best_color, best_text, best_conf, crop_name, best_proc, best_crop_params
 
 # ----------------------------- TRADITIONAL EXTRACTION -----------------------------
 def extract_with_tesseract(text):
-    order_ids = list(set(re.findall(r'\d{3}-\d{7}-\d{7}', text)))
-    prices = re.findall(r'\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?', text)
-    dates = re.findall(r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}', text)
-    totals = re.findall(r'(?:Order Total|Grand Total|Total)[\s:]*(\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-    quantities = re.findall(r'(?:Qty|Quantity)[\.:]?\s*(\d+)', text, re.IGNORECASE)
-    sellers = list(set(re.findall(r'Sold by[:\s]*(.+?)(?:\n|$)', text)))
-    lines = [l.strip() for l in text.split('\n') if l.strip() and len(l) > 10]
-    items = []
-    for line in lines:
-        clean = re.sub(r'\$[\d,]+\.?\d*|\d{3}-\d{7}.*', '', line).strip()
-        if len(clean) > 15 and clean[0].isupper() and not re.search(r'total|shipping|tax|qty|sold by', clean, re.IGNORECASE):
-            items.append(clean)
-    items = list(set(items))
+    order_ids = list(dict.fromkeys(_ORDER_RE.findall(text)))
+    prices = _PRICE_RE.findall(text)
+    dates = _DATE_RE.findall(text)
+    totals = _TOTAL_RE.findall(text)
+    quantities = _QTY_RE.findall(text)
+    sellers = list(dict.fromkeys(_SELLER_RE.findall(text)))
+    # Single pass over the lines; blank lines can never pass the length checks
+    items = list(dict.fromkeys(
+        clean for clean in (_CLEAN_RE.sub('', line.strip()).strip()
+                            for line in text.split('\n') if len(line) > 10)
+        if len(clean) > 15 and clean[0].isupper() and not _EXCLUDE_RE.search(clean)
+    ))
     return order_ids, prices, dates, totals, quantities, sellers, items
 
 # ----------------------------- AI EXTRACTION -----------------------------
-def extract_with_ai(image_path, provider, ollama_model="llava", openai_model="gpt-4o-mini"):
-    with open(image_path, "rb") as img_file:
-        base64_image = base64.b64encode(img_file.read()).decode('utf-8')
+def encode_for_ai(bgr_img):
+    # Encode in memory; no temp file round-trip
+    ok, buf = cv2.imencode('.jpg', bgr_img, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    if not ok:
+        return None
+    return base64.b64encode(buf.tobytes()).decode('ascii')
+
+def extract_with_ai(base64_image, provider, ollama_model="llava", openai_model="gpt-4o-mini"):
+    if base64_image is None:
+        return None, None, None, None, None, None, None, "AI Image Encode Failed"
 
     prompt = """
 You are an expert Amazon order analyst. Extract structured data from this screenshot as VALID JSON ONLY (no extra text or markdown):
@@ -179,7 +310,7 @@ If no data found, use null/empty. Be precise.
 
     if provider == "ollama":
         try:
-            response = requests.post(
+            response = get_http_session().post(
                 "http://localhost:11434/api/chat",
                 json={
                     "model": ollama_model,
@@ -190,7 +321,8 @@ If no data found, use null/empty. Be precise.
                             "images": [base64_image]
                         }
                     ],
-                    "stream": False
+                    "stream": False,
+                    "keep_alive": "10m"  # Keep the model loaded between files
                 }
             )
             response.raise_for_status()
@@ -200,11 +332,12 @@ If no data found, use null/empty. Be precise.
             return None
 
     elif provider == "openai":
-        if OpenAIClient is None:
+        try:
+            client = get_openai_client()
+        except ImportError:
             print("\033[91mOpenAI library not installed. pip install openai\033[0m")
             return None
         try:
-            client = OpenAIClient()
             response = client.chat.completions.create(
                 model=openai_model,
                 messages=[
@@ -223,9 +356,10 @@ If no data found, use null/empty. Be precise.
             print(f"\033[91mOpenAI error: {e} (check API key)\033[0m")
             return None
 
-    # Parse JSON
+    # Parse JSON (local models often wrap it in extra text or markdown fences)
     try:
-        data = json.loads(content)
+        json_match = _JSON_RE.search(content)
+        data = json_loads(json_match.group() if json_match else content)
         # Normalize to lists/strings
         order_ids = [data.get("order_id")] if data.get("order_id") else []
         dates = [data.get("order_date")] if data.get("order_date") else []
@@ -238,6 +372,109 @@ If no data found, use null/empty. Be precise.
     except:
         return None, None, None, None, None, None, None, "AI JSON Parse Failed"
 
+# ----------------------------- PER-FILE OCR (runs in worker processes) -----------------------------
+def process_file(filename, options):
+    file_path = os.path.join(options["input"], filename)
+
+    best_color, tess_text, tess_conf, crop_used, best_proc, crop_params = get_best_image(file_path)
+
+    if best_color is None:
+        return {"filename": filename, "failed": True}
+
+    # Tesseract extraction
+    extracted = extract_with_tesseract(tess_text)
+    orders = extracted[0]
+
+    # Decide if to use AI; the call itself is made from the parent's AI thread pool
+    use_ai_now = (options["use_ai"] == 'always') or (options["use_ai"] == 'hybrid' and (tess_conf < 70 or not orders))
+
+    # Save enhanced images if aggressive
+    cropped_file = processed_file = ""
+    if options["aggressive"]:
+        enhanced_folder = options["enhanced_folder"]
+        base, ext = os.path.splitext(filename)
+        if crop_used != "Full Image":
+            safe_crop = crop_used.replace(' ', '_')
+            cropped_file = f"{base}_cropped_{safe_crop}{ext}"
+            cv2.imwrite(os.path.join(enhanced_folder, cropped_file), best_color)
+        processed_file = f"{base}_processed{ext}"
+        cv2.imwrite(os.path.join(enhanced_folder, processed_file), best_proc)
+
+    return {
+        "filename": filename,
+        "failed": False,
+        "tess_text": tess_text,
+        "tess_conf": float(tess_conf),
+        "crop_used": crop_used,
+        "cropped_file": cropped_file,
+        "processed_file": processed_file,
+        "extracted": extracted,
+        # Original color image (cropped if better), only when AI will look at it
+        "ai_image": encode_for_ai(best_color) if use_ai_now else None,
+    }
+
+# ----------------------------- AI PASS (runs in the parent's thread pool) -----------------------------
+def run_ai(result, options):
+    ai_result = extract_with_ai(
+        result["ai_image"], options["ai_provider"], options["ollama_model"], options["openai_model"]
+    )
+    return result, ai_result
+
+# ----------------------------- ROW BUILDING -----------------------------
+def finish_row(result, ai_result, options):
+    filename = result["filename"]
+    if result["failed"]:
+        status = "Failed Load"
+        return as_csv_row({"File Name": filename, "Status": status}), None
+
+    orders, prices, dates, totals, qtys, sellers, items = result["extracted"]
+    tess_text = result["tess_text"]
+    tess_conf = result["tess_conf"]
+    crop_used = result["crop_used"]
+
+    ai_used = False
+    ai_provider = ""
+    ai_status = ""
+
+    # Provider errors come back as None
+    if ai_result is not None:
+        ai_orders, ai_prices, ai_dates, ai_totals, ai_qtys, ai_sellers, ai_items, ai_status = ai_result
+
+        if ai_orders is not None:
+            # Prefer AI results
+            orders, prices, dates, totals, qtys, sellers, items = ai_orders, ai_prices, ai_dates, ai_totals, ai_qtys, ai_sellers, ai_items
+            ai_used = True
+            ai_provider = options["ai_provider"]
+
+    # Status
+    status = "\033[92mSuccess 🐾\033[0m" if orders else "\033[93mReview Required 🙀\033[0m"
+    if crop_used != "Full Image":
+        status += f" \033[90m(Cropped: {crop_used})\033[0m"
+    if ai_used:
+        status += f" \033[96m(AI: {ai_provider.upper()} {ai_status})\033[0m"
+
+    message = f"[{status}] {filename} → {len(orders)} order(s), {len(items)} item(s), conf: {tess_conf:.1f}%"
+
+    row = {
+        "File Name": filename,
+        "Status": status.replace("\033[", "").split("m")[0],
+        "AI Used": "Yes" if ai_used else "No",
+        "AI Provider": ai_provider,
+        "Tesseract Confidence (%)": round(tess_conf, 1),
+        "Crop Used": crop_used,
+        "Cropped Image": result["cropped_file"],
+        "Processed Image": result["processed_file"],
+        "Order IDs": " | ".join(orders),
+        "Prices": " | ".join(prices),
+        "Dates": " | ".join(dates),
+        "Totals": " | ".join(totals),
+        "Quantities": " | ".join(qtys),
+        "Sellers": " | ".join(sellers),
+        "Items": " | ".join(items),
+        "Raw Tesseract Snippet": tess_text[:200] + "..." if len(tess_text) > 200 else tess_text
+    }
+    return as_csv_row(row), message
+
 # ----------------------------- MAIN -----------------------------
 def main():
     print_banner()
@@ -250,18 +487,23 @@ def main():
     parser.add_argument('--ai-provider', choices=['ollama', 'openai'], default='ollama', help='AI backend')
     parser.add_argument('--ollama-model', default='llava', help='Ollama model (e.g., qwen2-vl:7b, llava:13b)')
     parser.add_argument('--openai-model', default='gpt-4o-mini', help='OpenAI model (gpt-4o-mini or gpt-4o)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Parallel OCR worker processes')
+    parser.add_argument('--ai-workers', type=int, default=8, help='Concurrent AI requests (for Ollama, also set OLLAMA_NUM_PARALLEL)')
     args = parser.parse_args()
 
     if args.use_ai != 'never':
         print(f"\033[1m😼 AI mode: {args.use_ai.upper()} | Provider: {args.ai_provider.upper()}\033[0m\n")
 
+    enhanced_folder = "meowzon_enhanced_images"
     if args.aggressive:
-        enhanced_folder = "meowzon_enhanced_images"
         os.makedirs(enhanced_folder, exist_ok=True)
 
     # Tesseract check
     try:
-        pytesseract.get_tesseract_version()
+        if tesserocr is not None:
+            tesserocr.tesseract_version()
+        else:
+            pytesseract.get_tesseract_version()
     except:
         print("\033[91mTesseract not found!\033[0m")
         sys.exit(1)
@@ -276,85 +518,37 @@ def main():
         print("\033[93mNo images found!\033[0m")
         sys.exit(0)
 
-    all_data = []
+    # Plain dict so it pickles cleanly into the worker processes
+    options = vars(args).copy()
+    options["enhanced_folder"] = enhanced_folder
+
+    # Stream rows to the CSV as they complete (constant memory, buffered writes)
+    with open(args.output, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csv_file:
+        writer = csv.writer(csv_file, lineterminator=os.linesep)
+        writer.writerow(CSV_FIELDS)
+
+        def write_row(row, message):
+            if message:
+                print(message)
+            writer.writerow(row)
+
+        # Each screenshot is independent, so OCR them across all cores while
+        # AI requests for finished files run concurrently in a thread pool
+        ai_futures = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.ai_workers) as ai_pool, \
+                concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = executor.map(process_file, files, itertools.repeat(options), chunksize=4)
+            for result in tqdm(results, total=len(files), desc="Purr-cessing", unit="paw"):
+                if result.get("ai_image"):
+                    ai_futures.append(ai_pool.submit(run_ai, result, options))
+                else:
+                    write_row(*finish_row(result, None, options))
+
+            if ai_futures:
+                done = concurrent.futures.as_completed(ai_futures)
+                for future in tqdm(done, total=len(ai_futures), desc="AI purr-cessing", unit="paw"):
+                    write_row(*finish_row(*future.result(), options))
 
-    for filename in tqdm(files, desc="Purr-cessing", unit="paw"):
-        file_path = os.path.join(folder_path, filename)
-
-        best_color, tess_text, tess_conf, crop_used, best_proc, crop_params = get_best_image(file_path)
-
-        if best_color is None:
-            status = "Failed Load"
-            all_data.append({"File Name": filename, "Status": status})
-            continue
-
-        # Tesseract extraction
-        orders, prices, dates, totals, qtys, sellers, items = extract_with_tesseract(tess_text)
-
-        ai_used = False
-        ai_provider = ""
-        ai_status = ""
-
-        # Decide if to use AI
-        use_ai_now = (args.use_ai == 'always') or (args.use_ai == 'hybrid' and (tess_conf < 70 or not orders))
-
-        if use_ai_now:
-            # Save temp image for AI (original color, cropped if better)
-            temp_img_path = os.path.join("temp_ai_image.jpg")
-            cv2.imwrite(temp_img_path, best_color)
-
-            ai_orders, ai_prices, ai_dates, ai_totals, ai_qtys, ai_sellers, ai_items, ai_status = extract_with_ai(
-                temp_img_path, args.ai_provider, args.ollama_model, args.openai_model
-            )
-            os.remove(temp_img_path)
-
-            if ai_orders is not None:
-                # Prefer AI results
-                orders, prices, dates, totals, qtys, sellers, items = ai_orders, ai_prices, ai_dates, ai_totals, ai_qtys, ai_sellers, ai_items
-                ai_used = True
-                ai_provider = args.ai_provider
-
-        # Save enhanced images if aggressive
-        cropped_file = processed_file = ""
-        if args.aggressive:
-            base, ext = os.path.splitext(filename)
-            if crop_used != "Full Image":
-                safe_crop = crop_used.replace(' ', '_')
-                cropped_file = f"{base}_cropped_{safe_crop}{ext}"
-                cv2.imwrite(os.path.join(enhanced_folder, cropped_file), best_color)
-            processed_file = f"{base}_processed{ext}"
-            cv2.imwrite(os.path.join(enhanced_folder, processed_file), best_proc)
-
-        # Status
-        status = "\033[92mSuccess 🐾\033[0m" if orders else "\033[93mReview Required 🙀\033[0m"
-        if crop_used != "Full Image":
-            status += f" \033[90m(Cropped: {crop_used})\033[0m"
-        if ai_used:
-            status += f" \033[96m(AI: {ai_provider.upper()} {ai_status})\033[0m"
-
-        print(f"[{status}] {filename} → {len(orders)} order(s), {len(items)} item(s), conf: {tess_conf:.1f}%")
-
-        all_data.append({
-            "File Name": filename,
-            "Status": status.replace("\033[", "").split("m")[0],
-            "AI Used": "Yes" if ai_used else "No",
-            "AI Provider": ai_provider,
-            "Tesseract Confidence (%)": round(tess_conf, 1),
-            "Crop Used": crop_used,
-            "Cropped Image": cropped_file,
-            "Processed Image": processed_file,
-            "Order IDs": " | ".join(orders),
-            "Prices": " | ".join(prices),
-            "Dates": " | ".join(dates),
-            "Totals": " | ".join(totals),
-            "Quantities": " | ".join(qtys),
-            "Sellers": " | ".join(sellers),
-            "Items": " | ".join(items),
-            "Raw Tesseract Snippet": tess_text[:200] + "..." if len(tess_text) > 200 else tess_text
-        })
-
-    df = pd.DataFrame(all_data)
-    df.to_csv(args.output, index=False)
     print(f"\n\033[1;32mDone! CSV: {args.output} 🐈\033[0m")
     if args.aggressive:
         print(f"\033[1;32mEnhanced images in '{enhanced_folder}/'\033[0m")
@@ -10,9 +10,6 @@ import argparse
 from pathlib import Path
 
 from meowzon.config import ExtractorConfig, create_default_config
-from meowzon.extractor import MeowzonExtractor
-from meowzon.logging_utils import setup_logging
-from meowzon.interactive_review import run_interactive_review
 
 
 def print_banner():
@@ -158,6 +155,19 @@ Supported AI Providers:
         help='OpenAI model (default: gpt-4o-mini)'
     )
     
+    parser.add_argument(
+        '--ai-batch-size',
+        type=int,
+        default=1,
+        help='Screenshots per AI request; >1 batches AI calls after OCR (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--no-ai-cache',
+        action='store_true',
+        help='Always query the AI provider, even for screenshots seen before'
+    )
+    
     # Features
     parser.add_argument(
         '--interactive',
@@ -171,6 +181,12 @@ Supported AI Providers:
         help='Disable analytics plot generation'
     )
     
+    parser.add_argument(
+        '--no-ocr-cache',
+        action='store_true',
+        help='Always run Tesseract, even for images OCR\'d before'
+    )
+    
     parser.add_argument(
         '--confidence-threshold',
         type=float,
@@ -224,6 +240,8 @@ def main():
         config.max_workers = args.workers
         config.enable_interactive_review = args.interactive
         config.generate_plots = not args.no_plot
+        config.enable_ai_cache = not args.no_ai_cache
+        config.enable_ocr_cache = not args.no_ocr_cache
         config.tesseract_confidence_threshold = args.confidence_threshold
         config.enable_logging = not args.no_log_file
         config.log_level = args.log_level
@@ -235,6 +253,11 @@ def main():
         print(f"❌ Configuration error: {e}")
         return 1
     
+    # Heavy imports (OpenCV, pandas, Tesseract) only once there is work to do
+    from meowzon.extractor import MeowzonExtractor
+    from meowzon.logging_utils import setup_logging
+    from meowzon.interactive_review import run_interactive_review
+    
     # Setup logging
     logger = setup_logging(
         log_file=config.log_file if config.enable_logging else None,
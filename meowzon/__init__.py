@@ -7,8 +7,23 @@ __author__ = "Meowzon Team"
 __description__ = "Cat-themed AI-hybrid OCR tool for extracting Amazon order details"
 
 from .config import ExtractorConfig
-from .extractor import MeowzonExtractor
-from .interactive_review import run_interactive_review
+
+# Heavy re-exports (OpenCV, pandas, Tesseract) load on first access, so
+# importing the package for its config or CLI stays fast
+_LAZY_EXPORTS = {
+    'MeowzonExtractor': '.extractor',
+    'run_interactive_review': '.interactive_review',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'ExtractorConfig',
@@ -0,0 +1,48 @@
+"""
+Persistent cache of AI extraction results keyed by image content
+"""
+
+import json
+import time
+from typing import Dict, List, Optional
+
+from .cache_store import SQLiteStore
+
+
+class AIResultCache(SQLiteStore):
+    """SQLite store of normalized AI results per (image, provider, model)"""
+    
+    TABLE = "ai_results"
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS ai_results ("
+        "hash BLOB NOT NULL, provider TEXT NOT NULL, model TEXT NOT NULL, "
+        "result_json TEXT NOT NULL, ts REAL NOT NULL, "
+        "PRIMARY KEY (hash, provider, model))"
+    )
+    LABEL = "AI cache"
+    
+    def get(self, digest: bytes, provider: str, model: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Look up a cached result
+        
+        Args:
+            digest: Image digest from image_digest()
+            provider: Provider name
+            model: Model name
+        
+        Returns:
+            Normalized result dict, or None on a miss
+        """
+        row = self._fetchone(
+            "SELECT result_json FROM ai_results "
+            "WHERE hash = ? AND provider = ? AND model = ?",
+            (digest, provider, model)
+        )
+        return json.loads(row[0]) if row else None
+    
+    def put(self, digest: bytes, provider: str, model: str, result: Dict[str, List[str]]):
+        """Store a successful result, replacing any earlier one"""
+        self._write(
+            "INSERT OR REPLACE INTO ai_results VALUES (?, ?, ?, ?, ?)",
+            (digest, provider, model, json.dumps(result), time.time())
+        )
@@ -3,22 +3,129 @@ AI provider implementations for vision-based extraction
 """
 
 from abc import ABC, abstractmethod
-import base64
+import asyncio
+import functools
 import json
+import os
+import random
+import re
+import threading
 import time
 import requests
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Type, Union
 
+from .ai_cache import AIResultCache
+from .cache_store import image_digest
 from .config import ExtractorConfig
 from .logging_utils import LoggerMixin
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
-# AI extraction prompt template
-AI_EXTRACTION_PROMPT = """
-You are an expert Amazon order analyst. Extract structured data from this Amazon order screenshot.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-Return ONLY valid JSON with this exact structure (no markdown, no extra text):
+# HTTP/2 support for httpx (the httpx[http2] extra)
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+# SIMD base64 encoder when installed, same output as the stdlib one
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import b64encode as _b64encode
+
+# Opening ``` fence (with optional language tag) or closing fence of a reply
+_FENCE_RE = re.compile(r'^```[\w-]*[ \t]*\n?|\n?[ \t]*```\s*$')
 
+
+def _json_loads(text: str):
+    """Parse JSON with orjson when available (raises ValueError on bad input)"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+class _JSONScanner:
+    """
+    Incremental brace-depth scanner for the first {...} object in a text
+    
+    Braces inside JSON strings are skipped. State carries over between
+    feed() calls, so a streamed reply can be scanned as it grows.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.start = -1  # Index of the current object's opening brace
+    
+    def feed(self, text: str, pos: int = 0) -> int:
+        """
+        Scan text[pos:], continuing from the previous call's state
+        
+        Args:
+            text: Text seen so far
+            pos: First index not scanned yet
+        
+        Returns:
+            Index just past the object's closing brace, or -1 if still open
+        """
+        depth, in_string, escaped = self.depth, self.in_string, self.escaped
+        end = -1
+        
+        for i in range(pos, len(text)):
+            char = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif depth == 0:
+                if char == '{':
+                    depth = 1
+                    self.start = i
+            elif char == '"':
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    end = i + 1
+                    break
+        
+        self.depth, self.in_string, self.escaped = depth, in_string, escaped
+        return end
+
+
+def _extract_first_json(text: str) -> Optional[str]:
+    """
+    Find the first balanced {...} object in free text
+    
+    Args:
+        text: Model response that may wrap JSON in prose
+    
+    Returns:
+        The object's source text, or None if there is no balanced object
+    """
+    scanner = _JSONScanner()
+    end = scanner.feed(text)
+    return text[scanner.start:end] if end != -1 else None
+
+
+# JSON structure requested for each screenshot
+_RESPONSE_SCHEMA = """
 {
   "order_id": "string or null",
   "order_date": "string or null",
@@ -35,41 +142,686 @@ Return ONLY valid JSON with this exact structure (no markdown, no extra text):
   "other_prices": ["array of strings"],
   "shipping_address": "string or null"
 }
+""".strip()
 
+_RESPONSE_RULES = """
 Rules:
 - Use null for missing data, never leave fields undefined
 - Keep prices in "$X.XX" format
 - Extract ALL items visible
 - Be precise and accurate
+""".strip()
+
+# AI extraction prompt template
+AI_EXTRACTION_PROMPT = f"""
+You are an expert Amazon order analyst. Extract structured data from this Amazon order screenshot.
+
+Return ONLY valid JSON with this exact structure (no markdown, no extra text):
+
+{_RESPONSE_SCHEMA}
+
+{_RESPONSE_RULES}
 - Return ONLY the JSON object
 """.strip()
 
+# Output token budget per screenshot (the schema's answers run a few hundred tokens)
+MAX_TOKENS_PER_IMAGE = 512
+
+_NULLABLE_STRING = {"type": ["string", "null"]}
+
+# _RESPONSE_SCHEMA as JSON Schema, for providers that enforce structured output
+ORDER_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "order_id": _NULLABLE_STRING,
+        "order_date": _NULLABLE_STRING,
+        "total": _NULLABLE_STRING,
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "quantity": {"type": ["integer", "null"]},
+                    "price": _NULLABLE_STRING,
+                },
+                "required": ["name"],
+            },
+        },
+        "seller": _NULLABLE_STRING,
+        "tracking_number": _NULLABLE_STRING,
+        "other_prices": {"type": "array", "items": {"type": "string"}},
+        "shipping_address": _NULLABLE_STRING,
+    },
+    "required": ["order_id", "order_date", "total", "items", "seller", "tracking_number"],
+}
+
+# Batch replies wrap one order object per screenshot
+BATCH_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {"results": {"type": "array", "items": ORDER_JSON_SCHEMA}},
+    "required": ["results"],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def ai_batch_prompt(count: int) -> str:
+    """Extraction prompt for count screenshots sent in one request"""
+    return f"""
+You are an expert Amazon order analyst. You will receive {count} Amazon order screenshots. Extract structured data from each one.
+
+Return ONLY valid JSON of the form {{"results": [...]}} (no markdown, no extra text), where "results" holds exactly {count} objects, one per screenshot in the order given, each with this exact structure:
+
+{_RESPONSE_SCHEMA}
+
+{_RESPONSE_RULES}
+- Return ONLY the JSON object
+""".strip()
+
+
+# Memory budget for cached base64 encodings, keys included
+ENCODE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class _EncodedImageCache:
+    """LRU cache of (base64, media type) image encodings, evicted by total size"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> ((base64, media_type), cost)
+        self._total = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key) -> Optional[Tuple[str, str]]:
+        """Return the cached encoding and mark it recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def put(self, key, encoded: Tuple[str, str], cost: int):
+        """Store an encoding, evicting least recently used entries over budget"""
+        if cost > self.max_bytes:
+            return
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total -= old[1]
+            
+            self._entries[key] = (encoded, cost)
+            self._total += cost
+            
+            while self._total > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._total -= evicted
+
+
+_encode_cache = _EncodedImageCache(ENCODE_CACHE_MAX_BYTES)
+
+
+# Leading file signatures of the image formats vision APIs accept
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', "image/png"),
+    (b'\xff\xd8\xff', "image/jpeg"),
+    (b'GIF87a', "image/gif"),
+    (b'GIF89a', "image/gif"),
+)
+
+
+def sniff_media_type(data: bytes) -> str:
+    """
+    Detect an image's media type from its first bytes
+    
+    Args:
+        data: Image file contents (the first 12 bytes are enough)
+    
+    Returns:
+        MIME type, defaulting to image/jpeg for unknown signatures
+    """
+    for signature, media_type in _IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return media_type
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return "image/webp"
+    return "image/jpeg"
+
+
+def _encode_image_cached(image: Union[str, bytes]) -> Tuple[str, str]:
+    """
+    Base64-encode an image file or bytes, reusing earlier encodings
+    
+    Files are keyed by (path, mtime, size) so edits are picked up;
+    in-memory images are keyed by their content.
+    
+    Args:
+        image: Path to image file, or encoded (JPEG) image bytes
+    
+    Returns:
+        Tuple of (base64 string, media type from the file signature)
+    """
+    if isinstance(image, bytes):
+        key, cost = image, len(image)
+    else:
+        stat = os.stat(image)
+        key, cost = (image, stat.st_mtime, stat.st_size), 0
+    
+    encoded = _encode_cache.get(key)
+    if encoded is None:
+        if isinstance(image, bytes):
+            data = image
+        else:
+            with open(image, "rb") as f:
+                data = f.read()
+        encoded = (_b64encode(data).decode('ascii'), sniff_media_type(data[:12]))
+        _encode_cache.put(key, encoded, cost + len(encoded[0]))
+    
+    return encoded
+
+
+# Cap on a single retry sleep, in seconds
+MAX_RETRY_BACKOFF = 30.0
+
+
+class CircuitBreaker:
+    """
+    Stop calling a provider that keeps failing
+    
+    Opens after failure_threshold consecutive failures. Once reset_timeout
+    seconds have passed, one trial request is let through (half-open):
+    success closes the breaker again, failure re-opens it.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.fail_count = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            
+            # A trial that never reported back (e.g. cancelled) re-arms after the timeout too
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half-open"
+                self.opened_at = time.monotonic()
+                return True
+            
+            return False
+    
+    def record_success(self):
+        """Close the breaker after a successful request"""
+        with self._lock:
+            self.state = "closed"
+            self.fail_count = 0
+    
+    def record_failure(self):
+        """Count a failed request, opening the breaker at the threshold"""
+        with self._lock:
+            self.fail_count += 1
+            if self.state == "half-open" or self.fail_count >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+@functools.lru_cache(maxsize=None)
+def shared_http_client(timeout: float):
+    """
+    Process-wide httpx client for the OpenAI and Anthropic SDKs, one per timeout
+    
+    Reusing one client keeps TLS sessions and keep-alive connections across
+    providers, and multiplexes concurrent requests over HTTP/2 when h2 is installed.
+    
+    Args:
+        timeout: Request timeout in seconds (config.ai_timeout)
+    
+    Returns:
+        httpx.Client, or None if httpx is not installed (SDK default client)
+    """
+    if httpx is None:
+        return None
+    return httpx.Client(
+        http2=h2 is not None,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=timeout,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def shared_session(pool_maxsize: int) -> requests.Session:
+    """
+    Process-wide requests session with a keep-alive pool of pool_maxsize
+    
+    Args:
+        pool_maxsize: Connections kept per host
+    
+    Returns:
+        Shared requests.Session
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 
 class AIProvider(ABC):
     """Base class for AI vision providers"""
     
+    # Provider label used in status messages
+    name = "AI"
+    
+    # Async SDK/HTTP client, opened lazily inside the running event loop
+    _async_client = None
+    
+    # config.ai_provider value -> provider class, filled as subclasses are defined
+    registry: Dict[str, Type['AIProvider']] = {}
+    
+    def __init_subclass__(cls, key: Optional[str] = None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if key:
+            AIProvider.registry[key] = cls
+    
     def __init__(self, config: ExtractorConfig):
         self.config = config
+        self.model = ""
         self.max_retries = config.ai_max_retries
         self.timeout = config.ai_timeout
+        self.cache = None
+        if config.enable_ai_cache:
+            self.cache = AIResultCache(
+                config.ai_cache_file, config.cache_max_age_days, config.cache_max_entries
+            )
+        self.breaker = CircuitBreaker()
     
     @abstractmethod
-    def extract(self, image_path: str) -> Tuple[Optional[Dict], str]:
+    def _complete(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """
+        Send one request with the prompt and images
+        
+        Args:
+            images: Paths to image files, or encoded (JPEG) image bytes
+            prompt: Extraction prompt
+        
+        Returns:
+            Raw response text
+        """
+        pass
+    
+    async def _complete_async(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """
+        Async variant of _complete
+        
+        Providers override this with their native async client; the default
+        runs the blocking _complete on a worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._complete, images, prompt)
+    
+    async def _close_async(self):
+        """Close the async client so the next event loop opens a fresh one"""
+        client, self._async_client = self._async_client, None
+        if client is not None:
+            close = getattr(client, 'aclose', None) or client.close
+            await close()
+    
+    def _fatal_status(self, error: Exception) -> Optional[str]:
+        """Status for errors that retrying cannot fix, or None to retry"""
+        return None
+    
+    def _error_status(self, error: Exception) -> str:
+        """Status reported once retries are exhausted"""
+        return f"{self.name} Error: {str(error)[:50]}"
+    
+    def _retry_status(self, error: Exception, attempt: int) -> Optional[str]:
+        """
+        Decide what to do after a failed attempt
+        
+        Args:
+            error: Exception raised by the request
+            attempt: Zero-based attempt number
+        
+        Returns:
+            Final status message, or None to back off and retry
+        """
+        fatal = self._fatal_status(error)
+        if fatal:
+            return fatal
+        
+        if attempt < self.max_retries - 1:
+            self.logger.warning(f"{self.name} error: {error}, retry {attempt + 1}/{self.max_retries}")
+            return None
+        
+        return self._error_status(error)
+    
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Full-jitter exponential backoff, so parallel retries do not move in lock-step"""
+        return random.uniform(0, min(MAX_RETRY_BACKOFF, 2 ** attempt))
+    
+    def _request_with_retries(
+        self,
+        images: List[Union[str, bytes]],
+        prompt: str
+    ) -> Tuple[Optional[str], str]:
+        """
+        Call _complete, retrying transient errors with exponential backoff
+        
+        Args:
+            images: Images to send in the request
+            prompt: Extraction prompt
+        
+        Returns:
+            Tuple of (response_text or None, status_message)
+        """
+        for attempt in range(self.max_retries):
+            if not self.breaker.allow():
+                return None, f"{self.name} Circuit Open"
+            
+            try:
+                content = self._complete(images, prompt)
+            
+            except Exception as e:
+                self.breaker.record_failure()
+                status = self._retry_status(e, attempt)
+                if status:
+                    return None, status
+                time.sleep(self._backoff(attempt))
+            
+            else:
+                self.breaker.record_success()
+                return content, ""
+        
+        return None, f"{self.name} Failed After Retries"
+    
+    async def _request_with_retries_async(
+        self,
+        images: List[Union[str, bytes]],
+        prompt: str
+    ) -> Tuple[Optional[str], str]:
+        """Async variant of _request_with_retries"""
+        for attempt in range(self.max_retries):
+            if not self.breaker.allow():
+                return None, f"{self.name} Circuit Open"
+            
+            try:
+                content = await self._complete_async(images, prompt)
+            
+            except Exception as e:
+                self.breaker.record_failure()
+                status = self._retry_status(e, attempt)
+                if status:
+                    return None, status
+                await asyncio.sleep(self._backoff(attempt))
+            
+            else:
+                self.breaker.record_success()
+                return content, ""
+        
+        return None, f"{self.name} Failed After Retries"
+    
+    def _to_result(self, data: Optional[Dict]) -> Tuple[Optional[Dict], str]:
+        """Normalize one parsed response into the (data, status) result"""
+        if data and isinstance(data, dict):
+            return self._normalize_to_lists(data), f"{self.name} Success"
+        return None, f"{self.name} JSON Parse Failed"
+    
+    def _cache_lookup(
+        self,
+        images: List[Union[str, bytes]]
+    ) -> Tuple[List[Optional[bytes]], List[Optional[Tuple[Dict, str]]]]:
+        """
+        Fetch cached results for images seen before
+        
+        Args:
+            images: Paths to image files, or encoded (JPEG) image bytes
+        
+        Returns:
+            Tuple of (digests, results) with None entries for cache misses
+        """
+        if self.cache is None:
+            return [None] * len(images), [None] * len(images)
+        
+        digests = [image_digest(image) for image in images]
+        results = []
+        
+        for digest in digests:
+            data = self.cache.get(digest, self.name, self.model)
+            results.append((data, f"{self.name} Success (cached)") if data is not None else None)
+        
+        return digests, results
+    
+    @staticmethod
+    def _group_misses(digests: List[Optional[bytes]], results: List) -> List[List[int]]:
+        """Indices of uncached images, grouped so identical images are sent once"""
+        groups = {}
+        for i, (digest, result) in enumerate(zip(digests, results)):
+            if result is None:
+                groups.setdefault(digest if digest is not None else i, []).append(i)
+        return list(groups.values())
+    
+    def _fill_misses(
+        self,
+        digests: List[Optional[bytes]],
+        results: List,
+        groups: List[List[int]],
+        fresh: List[Tuple[Optional[Dict], str]]
+    ) -> List[Tuple[Optional[Dict], str]]:
+        """Copy fresh results into every slot of their group and cache them"""
+        for group, result in zip(groups, fresh):
+            for i in group:
+                results[i] = result
+            
+            data = result[0]
+            if self.cache is not None and data is not None:
+                self.cache.put(digests[group[0]], self.name, self.model, data)
+        
+        return results
+    
+    def extract(self, image: Union[str, bytes]) -> Tuple[Optional[Dict], str]:
         """
         Extract data from image using AI
         
         Args:
-            image_path: Path to image file
+            image: Path to image file, or encoded (JPEG) image bytes
         
         Returns:
             Tuple of (extracted_data_dict, status_message)
         """
-        pass
+        return self.extract_batch([image], batch_size=1)[0]
     
-    def _encode_image(self, image_path: str) -> str:
-        """Encode image to base64"""
-        with open(image_path, "rb") as f:
-            return base64.b64encode(f.read()).decode('utf-8')
+    def _extract_uncached(self, image: Union[str, bytes]) -> Tuple[Optional[Dict], str]:
+        """Send one image to the provider, bypassing the result cache"""
+        content, status = self._request_with_retries([image], AI_EXTRACTION_PROMPT)
+        if content is None:
+            return None, status
+        
+        return self._to_result(self._parse_json_response(content))
+    
+    async def extract_async(self, image: Union[str, bytes]) -> Tuple[Optional[Dict], str]:
+        """Async variant of extract"""
+        digests, results = self._cache_lookup([image])
+        if results[0] is not None:
+            return results[0]
+        
+        return self._fill_misses(
+            digests, results, [[0]], [await self._extract_uncached_async(image)]
+        )[0]
+    
+    async def _extract_uncached_async(self, image: Union[str, bytes]) -> Tuple[Optional[Dict], str]:
+        """Async variant of _extract_uncached"""
+        content, status = await self._request_with_retries_async([image], AI_EXTRACTION_PROMPT)
+        if content is None:
+            return None, status
+        
+        return self._to_result(self._parse_json_response(content))
+    
+    def extract_batch(
+        self,
+        images: List[Union[str, bytes]],
+        batch_size: int = 4
+    ) -> List[Tuple[Optional[Dict], str]]:
+        """
+        Extract data from several images, batch_size images per request
+        
+        Images with a cached result are not sent again. Batches whose
+        response does not hold one result per image are retried one image
+        at a time.
+        
+        Args:
+            images: Paths to image files, or encoded (JPEG) image bytes
+            batch_size: Maximum images per request
+        
+        Returns:
+            List of (extracted_data_dict, status_message), one per image
+        """
+        digests, results = self._cache_lookup(images)
+        groups = self._group_misses(digests, results)
+        batches = [
+            [images[group[0]] for group in groups[start:start + batch_size]]
+            for start in range(0, len(groups), batch_size)
+        ]
+        
+        fresh = []
+        if len(batches) > 1:
+            # Prepare the next batch while the current request is in flight
+            with ThreadPoolExecutor(max_workers=1) as prefetcher:
+                upcoming = prefetcher.submit(self._prepare_images, batches[0])
+                for k, batch in enumerate(batches):
+                    upcoming.result()
+                    if k + 1 < len(batches):
+                        upcoming = prefetcher.submit(self._prepare_images, batches[k + 1])
+                    fresh.extend(self._extract_chunk(batch))
+        else:
+            for batch in batches:
+                fresh.extend(self._extract_chunk(batch))
+        
+        return self._fill_misses(digests, results, groups, fresh)
+    
+    async def extract_batch_async(
+        self,
+        images: List[Union[str, bytes]],
+        batch_size: int = 4,
+        concurrency: int = 8
+    ) -> List[Tuple[Optional[Dict], str]]:
+        """
+        Like extract_batch, but with up to concurrency requests in flight
+        
+        Args:
+            images: Paths to image files, or encoded (JPEG) image bytes
+            batch_size: Maximum images per request
+            concurrency: Maximum simultaneous requests
+        
+        Returns:
+            List of (extracted_data_dict, status_message), one per image
+        """
+        digests, results = self._cache_lookup(images)
+        groups = self._group_misses(digests, results)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        # Bounds how many batches are prepared ahead of a free request slot
+        lookahead = asyncio.Semaphore(concurrency * 2)
+        
+        async def run(batch):
+            async with lookahead:
+                # Encode off the event loop so it overlaps other requests' waits
+                await loop.run_in_executor(None, self._prepare_images, batch)
+                async with semaphore:
+                    return await self._extract_chunk_async(batch)
+        
+        try:
+            chunks = await asyncio.gather(*(
+                run([images[group[0]] for group in groups[start:start + batch_size]])
+                for start in range(0, len(groups), batch_size)
+            ))
+        finally:
+            await self._close_async()
+        
+        fresh = [result for chunk in chunks for result in chunk]
+        return self._fill_misses(digests, results, groups, fresh)
+    
+    def _prepare_images(self, images: List[Union[str, bytes]]):
+        """
+        Do per-image upload work ahead of the request
+        
+        The default warms the base64 cache that _encode_image reads from.
+        """
+        for image in images:
+            self._encode_image(image)
+    
+    def _extract_chunk(self, batch: List[Union[str, bytes]]) -> List[Tuple[Optional[Dict], str]]:
+        """Extract one request's worth of images"""
+        if len(batch) == 1:
+            return [self._extract_uncached(batch[0])]
+        
+        content, status = self._request_with_retries(batch, ai_batch_prompt(len(batch)))
+        if content is None:
+            return [(None, status)] * len(batch)
+        
+        items = self._split_batch_response(self._parse_json_response(content), len(batch))
+        if items is None:
+            self._warn_batch_mismatch(len(batch))
+            return [self._extract_uncached(image) for image in batch]
+        
+        return [self._to_result(item) for item in items]
+    
+    async def _extract_chunk_async(
+        self,
+        batch: List[Union[str, bytes]]
+    ) -> List[Tuple[Optional[Dict], str]]:
+        """Async variant of _extract_chunk"""
+        if len(batch) == 1:
+            return [await self._extract_uncached_async(batch[0])]
+        
+        content, status = await self._request_with_retries_async(batch, ai_batch_prompt(len(batch)))
+        if content is None:
+            return [(None, status)] * len(batch)
+        
+        items = self._split_batch_response(self._parse_json_response(content), len(batch))
+        if items is None:
+            self._warn_batch_mismatch(len(batch))
+            return list(await asyncio.gather(*(self._extract_uncached_async(image) for image in batch)))
+        
+        return [self._to_result(item) for item in items]
+    
+    def _warn_batch_mismatch(self, count: int):
+        """Log a batch response that cannot be mapped back to its images"""
+        self.logger.warning(
+            f"{self.name} batch response did not match {count} images, "
+            f"retrying individually"
+        )
+    
+    @staticmethod
+    def _split_batch_response(data, count: int) -> Optional[List]:
+        """
+        Map a batch response back to its input images
+        
+        Args:
+            data: Parsed batch response ({"results": [...]} or a bare list)
+            count: Number of images in the batch
+        
+        Returns:
+            List with one entry per image, or None if the count does not match
+        """
+        items = data.get('results') if isinstance(data, dict) else data
+        if not isinstance(items, list) or len(items) != count:
+            return None
+        return items
+    
+    def _encode_image(self, image: Union[str, bytes]) -> str:
+        """Encode image file or bytes to base64 (cached across retries and providers)"""
+        return _encode_image_cached(image)[0]
+    
+    def _encode_image_typed(self, image: Union[str, bytes]) -> Tuple[str, str]:
+        """Like _encode_image, but also return the media type detected from the bytes"""
+        return _encode_image_cached(image)
     
     def _parse_json_response(self, content: str) -> Optional[Dict]:
         """
@@ -82,29 +834,18 @@ class AIProvider(ABC):
             Parsed JSON dict or None
         """
         # Remove markdown code blocks if present
-        content = content.strip()
-        if content.startswith('```'):
-            # Remove opening ```json or ```
-            lines = content.split('\n')
-            if lines[0].startswith('```'):
-                lines = lines[1:]
-            # Remove closing ```
-            if lines[-1].strip() == '```':
-                lines = lines[:-1]
-            content = '\n'.join(lines)
+        content = _FENCE_RE.sub('', content.strip())
         
         # Try to parse JSON
         try:
-            data = json.loads(content)
-            return data
-        except json.JSONDecodeError as e:
+            return _json_loads(content)
+        except ValueError:
             # Try to find JSON object in text
-            import re
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
+            candidate = _extract_first_json(content)
+            if candidate:
                 try:
-                    return json.loads(json_match.group())
-                except:
+                    return _json_loads(candidate)
+                except ValueError:
                     pass
             return None
     
@@ -174,207 +915,311 @@ class AIProvider(ABC):
         return result
 
 
-class OllamaProvider(AIProvider, LoggerMixin):
+class _OllamaReply:
+    """Collects a streamed Ollama chat reply, stopping once its JSON object closes"""
+    
+    def __init__(self, timeout: float):
+        self.text = ""
+        self.deadline = time.monotonic() + timeout
+        self._scanner = _JSONScanner()
+        self._stop_early = True
+    
+    def add(self, line: Union[str, bytes]) -> bool:
+        """
+        Consume one NDJSON chunk of the stream
+        
+        Args:
+            line: One line of the response body
+        
+        Returns:
+            True once the reply is complete
+        """
+        chunk = _json_loads(line)
+        if chunk.get("error"):
+            raise RuntimeError(f"Ollama error: {chunk['error']}")
+        
+        piece = chunk.get("message", {}).get("content", "")
+        if piece:
+            pos = len(self.text)
+            self.text += piece
+            
+            if self._stop_early:
+                end = self._scanner.feed(self.text, pos)
+                if end != -1:
+                    try:
+                        _json_loads(self.text[self._scanner.start:end])
+                        return True
+                    except ValueError:
+                        # Braces in prose, not the answer; read to the end instead
+                        self._stop_early = False
+        
+        # Read timeouts never fire while tokens keep arriving, so cap the total
+        if time.monotonic() > self.deadline:
+            raise TimeoutError("Ollama reply exceeded the AI timeout")
+        
+        return bool(chunk.get("done"))
+
+
+class OllamaProvider(AIProvider, LoggerMixin, key='ollama'):
     """Ollama local AI provider"""
     
+    name = "Ollama"
+    
     def __init__(self, config: ExtractorConfig):
         super().__init__(config)
         self.model = config.ollama_model
         self.base_url = "http://localhost:11434"
+        
+        # Keep-alive connections, enough for every concurrent request of the AI pass
+        self.session = shared_session(max(10, config.max_workers * 4))
+        
+        # Request fields that never change between calls
+        self._body_template = {
+            "model": self.model,
+            "stream": True,  # Stop reading as soon as the JSON answer is complete
+            "format": "json",  # Constrain decoding to valid JSON
+            "options": {
+                "temperature": 0.1,  # Low temperature for consistency
+            }
+        }
+    
+    def _chat_payload(self, images: List[Union[str, bytes]], prompt: str) -> Dict:
+        """Request body for Ollama's chat API"""
+        return {
+            **self._body_template,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt,
+                    "images": [self._encode_image(image) for image in images]
+                }
+            ],
+        }
     
-    def extract(self, image_path: str) -> Tuple[Optional[Dict], str]:
-        """Extract data using Ollama"""
-        base64_image = self._encode_image(image_path)
+    def _complete(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """Send images to Ollama's chat API and read the streamed reply"""
+        reply = _OllamaReply(self.timeout)
         
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": AI_EXTRACTION_PROMPT,
-                                "images": [base64_image]
-                            }
-                        ],
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.1,  # Low temperature for consistency
-                        }
-                    },
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                
-                content = response.json()["message"]["content"]
-                data = self._parse_json_response(content)
-                
-                if data:
-                    normalized = self._normalize_to_lists(data)
-                    return normalized, "Ollama Success"
-                else:
-                    return None, "Ollama JSON Parse Failed"
-                
-            except requests.exceptions.ConnectionError:
-                return None, "Ollama Not Running (start with 'ollama serve')"
-            
-            except requests.exceptions.Timeout:
-                if attempt < self.max_retries - 1:
-                    self.logger.warning(f"Ollama timeout, retry {attempt + 1}/{self.max_retries}")
-                    time.sleep(2 ** attempt)
-                else:
-                    return None, "Ollama Timeout"
-            
-            except Exception as e:
-                if attempt < self.max_retries - 1:
-                    self.logger.warning(f"Ollama error: {e}, retry {attempt + 1}/{self.max_retries}")
-                    time.sleep(2 ** attempt)
-                else:
-                    return None, f"Ollama Error: {str(e)[:50]}"
+        with self.session.post(
+            f"{self.base_url}/api/chat",
+            json=self._chat_payload(images, prompt),
+            timeout=self.timeout,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line and reply.add(line):
+                    break
+        
+        return reply.text
+    
+    async def _complete_async(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """Send images to Ollama's chat API over a pooled httpx client"""
+        if httpx is None:
+            return await super()._complete_async(images, prompt)
         
-        return None, "Ollama Failed After Retries"
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+        
+        reply = _OllamaReply(self.timeout)
+        
+        async with self._async_client.stream(
+            "POST", "/api/chat", json=self._chat_payload(images, prompt)
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line and reply.add(line):
+                    break
+        
+        return reply.text
+    
+    def _fatal_status(self, error: Exception) -> Optional[str]:
+        if isinstance(error, requests.exceptions.ConnectionError) or (
+            httpx is not None and isinstance(error, httpx.ConnectError)
+        ):
+            return "Ollama Not Running (start with 'ollama serve')"
+        return None
+    
+    def _error_status(self, error: Exception) -> str:
+        if isinstance(error, (requests.exceptions.Timeout, TimeoutError)) or (
+            httpx is not None and isinstance(error, httpx.TimeoutException)
+        ):
+            return "Ollama Timeout"
+        return super()._error_status(error)
 
 
-class OpenAIProvider(AIProvider, LoggerMixin):
+class OpenAIProvider(AIProvider, LoggerMixin, key='openai'):
     """OpenAI GPT-4 Vision provider"""
     
+    name = "OpenAI"
+    
     def __init__(self, config: ExtractorConfig):
         super().__init__(config)
         self.model = config.openai_model
         
         try:
             from openai import OpenAI
-            self.client = OpenAI()  # Uses OPENAI_API_KEY env var
+            # Uses OPENAI_API_KEY env var; the SDK sends its own timeout with every
+            # request, so it is given ai_timeout too
+            self.client = OpenAI(
+                http_client=shared_http_client(self.timeout), timeout=self.timeout
+            )
         except ImportError:
             raise ImportError("OpenAI library not installed. Run: pip install openai")
+        
+        # Request fields that never change between calls
+        self._request_template = {
+            "model": self.model,
+            "temperature": 0.1,
+            "response_format": {"type": "json_object"},  # Server-side valid JSON
+        }
     
-    def extract(self, image_path: str) -> Tuple[Optional[Dict], str]:
-        """Extract data using OpenAI GPT-4 Vision"""
-        base64_image = self._encode_image(image_path)
+    def _request_kwargs(self, images: List[Union[str, bytes]], prompt: str) -> Dict:
+        """Arguments for chat.completions.create"""
+        image_parts = []
+        for image in images:
+            data, media_type = self._encode_image_typed(image)
+            image_parts.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:{media_type};base64,{data}",
+                    "detail": "high"
+                }
+            })
         
-        for attempt in range(self.max_retries):
-            try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {"type": "text", "text": AI_EXTRACTION_PROMPT},
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{base64_image}",
-                                        "detail": "high"
-                                    }
-                                }
-                            ]
-                        }
-                    ],
-                    max_tokens=1000,
-                    temperature=0.1,
-                )
-                
-                content = response.choices[0].message.content
-                data = self._parse_json_response(content)
-                
-                if data:
-                    normalized = self._normalize_to_lists(data)
-                    return normalized, "OpenAI Success"
-                else:
-                    return None, "OpenAI JSON Parse Failed"
-                
-            except Exception as e:
-                error_msg = str(e)
-                if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
-                    return None, "OpenAI Auth Error (check OPENAI_API_KEY)"
-                
-                if attempt < self.max_retries - 1:
-                    self.logger.warning(f"OpenAI error: {e}, retry {attempt + 1}/{self.max_retries}")
-                    time.sleep(2 ** attempt)
-                else:
-                    return None, f"OpenAI Error: {str(e)[:50]}"
+        return {
+            **self._request_template,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [{"type": "text", "text": prompt}] + image_parts
+                }
+            ],
+            "max_tokens": MAX_TOKENS_PER_IMAGE * len(images),
+        }
+    
+    def _complete(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """Send images to OpenAI GPT-4 Vision"""
+        response = self.client.chat.completions.create(**self._request_kwargs(images, prompt))
+        
+        return response.choices[0].message.content
+    
+    async def _complete_async(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """Send images to OpenAI GPT-4 Vision with the async client"""
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(timeout=self.timeout)
+        
+        response = await self._async_client.chat.completions.create(
+            **self._request_kwargs(images, prompt)
+        )
         
-        return None, "OpenAI Failed After Retries"
+        return response.choices[0].message.content
+    
+    def _fatal_status(self, error: Exception) -> Optional[str]:
+        error_msg = str(error).lower()
+        if "authentication" in error_msg or "api key" in error_msg:
+            return "OpenAI Auth Error (check OPENAI_API_KEY)"
+        return None
 
 
-class ClaudeProvider(AIProvider, LoggerMixin):
+class ClaudeProvider(AIProvider, LoggerMixin, key='claude'):
     """Anthropic Claude Vision provider"""
     
+    name = "Claude"
+    
     def __init__(self, config: ExtractorConfig):
         super().__init__(config)
         self.model = config.claude_model
         
         try:
             import anthropic
-            self.client = anthropic.Anthropic()  # Uses ANTHROPIC_API_KEY env var
+            # Uses ANTHROPIC_API_KEY env var; timeout as for OpenAI above
+            self.client = anthropic.Anthropic(
+                http_client=shared_http_client(self.timeout), timeout=self.timeout
+            )
         except ImportError:
             raise ImportError("Anthropic library not installed. Run: pip install anthropic")
+        
+        # Request fields that never change between calls
+        self._request_template = {"model": self.model, "temperature": 0.1}
     
-    def extract(self, image_path: str) -> Tuple[Optional[Dict], str]:
-        """Extract data using Claude Vision"""
-        base64_image = self._encode_image(image_path)
+    @staticmethod
+    @functools.lru_cache(maxsize=2)
+    def _tool_fields(batched: bool) -> Dict:
+        """Forced tool call whose input schema is the expected answer"""
+        tool = {
+            "name": "emit_orders" if batched else "emit_order",
+            "description": "Record the order details extracted from the screenshots",
+            "input_schema": BATCH_JSON_SCHEMA if batched else ORDER_JSON_SCHEMA,
+        }
+        return {"tools": [tool], "tool_choice": {"type": "tool", "name": tool["name"]}}
+    
+    @staticmethod
+    def _reply_text(message) -> str:
+        """JSON text of the tool call, or the plain text if the model gave none"""
+        for block in message.content:
+            if block.type == "tool_use":
+                return json.dumps(block.input)
+        return "".join(block.text for block in message.content if block.type == "text")
+    
+    def _request_kwargs(self, images: List[Union[str, bytes]], prompt: str) -> Dict:
+        """Arguments for messages.create"""
+        image_blocks = []
+        for image in images:
+            data, media_type = self._encode_image_typed(image)
+            image_blocks.append({
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": media_type,
+                    "data": data,
+                },
+            })
         
-        # Detect media type
-        media_type = "image/jpeg"
-        if image_path.lower().endswith('.png'):
-            media_type = "image/png"
-        elif image_path.lower().endswith('.webp'):
-            media_type = "image/webp"
+        return {
+            **self._request_template,
+            **self._tool_fields(len(images) > 1),
+            "max_tokens": MAX_TOKENS_PER_IMAGE * len(images),
+            "messages": [{
+                "role": "user",
+                "content": image_blocks + [
+                    {
+                        "type": "text",
+                        "text": prompt
+                    }
+                ],
+            }],
+        }
+    
+    def _complete(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """Send images to Claude Vision"""
+        message = self.client.messages.create(**self._request_kwargs(images, prompt))
         
-        for attempt in range(self.max_retries):
-            try:
-                message = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=1024,
-                    temperature=0.1,
-                    messages=[{
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type,
-                                    "data": base64_image,
-                                },
-                            },
-                            {
-                                "type": "text",
-                                "text": AI_EXTRACTION_PROMPT
-                            }
-                        ],
-                    }],
-                )
-                
-                content = message.content[0].text
-                data = self._parse_json_response(content)
-                
-                if data:
-                    normalized = self._normalize_to_lists(data)
-                    return normalized, "Claude Success"
-                else:
-                    return None, "Claude JSON Parse Failed"
-                
-            except Exception as e:
-                error_msg = str(e)
-                if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
-                    return None, "Claude Auth Error (check ANTHROPIC_API_KEY)"
-                
-                if attempt < self.max_retries - 1:
-                    self.logger.warning(f"Claude error: {e}, retry {attempt + 1}/{self.max_retries}")
-                    time.sleep(2 ** attempt)
-                else:
-                    return None, f"Claude Error: {str(e)[:50]}"
+        return self._reply_text(message)
+    
+    async def _complete_async(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """Send images to Claude Vision with the async client"""
+        if self._async_client is None:
+            import anthropic
+            self._async_client = anthropic.AsyncAnthropic(timeout=self.timeout)
+        
+        message = await self._async_client.messages.create(**self._request_kwargs(images, prompt))
         
-        return None, "Claude Failed After Retries"
+        return self._reply_text(message)
+    
+    def _fatal_status(self, error: Exception) -> Optional[str]:
+        error_msg = str(error).lower()
+        if "authentication" in error_msg or "api key" in error_msg:
+            return "Claude Auth Error (check ANTHROPIC_API_KEY)"
+        return None
 
 
-class GeminiProvider(AIProvider, LoggerMixin):
+class GeminiProvider(AIProvider, LoggerMixin, key='gemini'):
     """Google Gemini Vision provider"""
     
+    name = "Gemini"
+    
     def __init__(self, config: ExtractorConfig):
         super().__init__(config)
         self.model = config.gemini_model
@@ -390,45 +1235,54 @@ class GeminiProvider(AIProvider, LoggerMixin):
         except ImportError:
             raise ImportError("Google AI library not installed. Run: pip install google-generativeai")
     
-    def extract(self, image_path: str) -> Tuple[Optional[Dict], str]:
-        """Extract data using Gemini Vision"""
-        import PIL.Image
+    def _prepare_images(self, images: List[Union[str, bytes]]):
+        """Nothing to prepare; images are sent without base64"""
+        pass
+    
+    @staticmethod
+    def _contents(images: List[Union[str, bytes]], prompt: str) -> List:
+        """Prompt followed by the images as raw blobs (no PIL decode/re-encode)"""
+        blobs = []
+        for image in images:
+            if not isinstance(image, bytes):
+                with open(image, "rb") as f:
+                    image = f.read()
+            blobs.append({"mime_type": sniff_media_type(image[:12]), "data": image})
         
-        for attempt in range(self.max_retries):
-            try:
-                # Load image
-                image = PIL.Image.open(image_path)
-                
-                # Generate content
-                response = self.client.generate_content(
-                    [AI_EXTRACTION_PROMPT, image],
-                    generation_config={
-                        "temperature": 0.1,
-                        "max_output_tokens": 1000,
-                    }
-                )
-                
-                content = response.text
-                data = self._parse_json_response(content)
-                
-                if data:
-                    normalized = self._normalize_to_lists(data)
-                    return normalized, "Gemini Success"
-                else:
-                    return None, "Gemini JSON Parse Failed"
-                
-            except Exception as e:
-                error_msg = str(e)
-                if "api key" in error_msg.lower():
-                    return None, "Gemini Auth Error (check GOOGLE_API_KEY)"
-                
-                if attempt < self.max_retries - 1:
-                    self.logger.warning(f"Gemini error: {e}, retry {attempt + 1}/{self.max_retries}")
-                    time.sleep(2 ** attempt)
-                else:
-                    return None, f"Gemini Error: {str(e)[:50]}"
+        return [prompt] + blobs
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _generation_config(count: int) -> Dict:
+        """Generation settings sized for count screenshots (shared, do not mutate)"""
+        return {
+            "temperature": 0.1,
+            "max_output_tokens": MAX_TOKENS_PER_IMAGE * count,
+            "response_mime_type": "application/json",
+        }
+    
+    def _complete(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """Send images to Gemini Vision"""
+        response = self.client.generate_content(
+            self._contents(images, prompt),
+            generation_config=self._generation_config(len(images))
+        )
         
-        return None, "Gemini Failed After Retries"
+        return response.text
+    
+    async def _complete_async(self, images: List[Union[str, bytes]], prompt: str) -> str:
+        """Send images to Gemini Vision without blocking the event loop"""
+        response = await self.client.generate_content_async(
+            self._contents(images, prompt),
+            generation_config=self._generation_config(len(images))
+        )
+        
+        return response.text
+    
+    def _fatal_status(self, error: Exception) -> Optional[str]:
+        if "api key" in str(error).lower():
+            return "Gemini Auth Error (check GOOGLE_API_KEY)"
+        return None
 
 
 def get_ai_provider(config: ExtractorConfig) -> AIProvider:
@@ -441,15 +1295,9 @@ def get_ai_provider(config: ExtractorConfig) -> AIProvider:
     Returns:
         AIProvider instance
     """
-    providers = {
-        'ollama': OllamaProvider,
-        'openai': OpenAIProvider,
-        'claude': ClaudeProvider,
-        'gemini': GeminiProvider,
-    }
-    
-    provider_class = providers.get(config.ai_provider)
-    if not provider_class:
-        raise ValueError(f"Unknown AI provider: {config.ai_provider}")
+    try:
+        provider_class = AIProvider.registry[config.ai_provider]
+    except KeyError:
+        raise ValueError(f"Unknown AI provider: {config.ai_provider}") from None
     
     return provider_class(config)
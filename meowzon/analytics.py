@@ -4,22 +4,215 @@ Analytics and reporting utilities
 
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass, field
+from itertools import chain
 from typing import Dict, List, Optional
 from pathlib import Path
 
 from .logging_utils import LoggerMixin
 
+# Optional: Polars for column aggregations (pyarrow backs from_pandas)
+try:
+    import polars as pl
+    import pyarrow  # noqa: F401
+except ImportError:
+    pl = None
+
+# Optional: Numba for the token-counting kernel
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Below this many rows the JIT dispatch costs more than the Python set union
+NUMBA_MIN_ROWS = 5000
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _count_unique_pipe_tokens(buf: np.ndarray) -> int:
+        """Count distinct '|'-separated byte tokens in a UTF-8 buffer"""
+        n = buf.shape[0]
+        
+        # Token boundaries
+        num_tokens = 1
+        for i in range(n):
+            if buf[i] == 124:
+                num_tokens += 1
+        
+        starts = np.empty(num_tokens, np.int64)
+        ends = np.empty(num_tokens, np.int64)
+        t = 0
+        starts[0] = 0
+        for i in range(n):
+            if buf[i] == 124:
+                ends[t] = i
+                t += 1
+                starts[t] = i + 1
+        ends[t] = n
+        
+        # Open-addressing hash set of token indices (FNV-1a hash)
+        size = 1
+        while size < 2 * num_tokens:
+            size <<= 1
+        mask = np.uint64(size - 1)
+        table = np.full(size, -1, np.int64)
+        unique = 0
+        
+        for t in range(num_tokens):
+            start = starts[t]
+            length = ends[t] - start
+            h = np.uint64(14695981039346656037)
+            for i in range(start, start + length):
+                h = (h ^ np.uint64(buf[i])) * np.uint64(1099511628211)
+            
+            slot = np.int64(h & mask)
+            while True:
+                other = table[slot]
+                if other == -1:
+                    table[slot] = t
+                    unique += 1
+                    break
+                other_start = starts[other]
+                if ends[other] - other_start == length:
+                    same = True
+                    for k in range(length):
+                        if buf[other_start + k] != buf[start + k]:
+                            same = False
+                            break
+                    if same:
+                        break
+                slot = (slot + 1) & (size - 1)
+        
+        return unique
+else:
+    _count_unique_pipe_tokens = None
+
+
+def count_unique_tokens(values: pd.Series) -> int:
+    """
+    Count distinct '|'-separated tokens across a string column
+    
+    Uses a Numba kernel over one joined byte buffer for large columns
+    when Numba is installed, otherwise a Python set union.
+    
+    Args:
+        values: Series of '|'-joined strings (missing values are ignored)
+    
+    Returns:
+        Number of distinct tokens
+    """
+    values = values.dropna()
+    if len(values) == 0:
+        return 0
+    
+    if _count_unique_pipe_tokens is not None and len(values) >= NUMBA_MIN_ROWS:
+        # Joining rows with '|' yields the same tokens as splitting each row
+        buf = np.frombuffer('|'.join(values).encode('utf-8'), dtype=np.uint8)
+        return int(_count_unique_pipe_tokens(buf))
+    
+    return len(set(chain.from_iterable(s.split('|') for s in values)))
+
+
+def _pl(df: pd.DataFrame, columns: List[str]) -> 'pl.LazyFrame':
+    """Lazy Polars view of selected dataframe columns"""
+    return pl.from_pandas(df[columns]).lazy()
+
+
+def _token_stats(df: pd.DataFrame) -> Dict:
+    """
+    Count orders, items and unique sellers from '|'-joined columns
+    
+    Runs as a single Polars query when Polars is installed, otherwise
+    falls back to per-column Python counting.
+    
+    Args:
+        df: DataFrame with extracted order data
+    
+    Returns:
+        Dictionary with total_orders, total_items and unique_sellers
+    """
+    stats = {'total_orders': 0, 'total_items': 0, 'unique_sellers': 0}
+    columns = {
+        key: col for key, col in (('total_orders', 'Order IDs'), ('total_items', 'Items'))
+        if col in df.columns
+    }
+    has_sellers = 'Sellers' in df.columns
+    
+    if pl is not None and (columns or has_sellers):
+        exprs = [
+            (pl.col(col).cast(pl.Utf8).str.count_matches('|', literal=True) + 1).sum().alias(key)
+            for key, col in columns.items()
+        ]
+        if has_sellers:
+            exprs.append(
+                pl.col('Sellers').cast(pl.Utf8).drop_nulls()
+                .str.split('|').explode().n_unique().alias('unique_sellers')
+            )
+        selected = list(columns.values()) + (['Sellers'] if has_sellers else [])
+        row = _pl(df, selected).select(exprs).collect().row(0, named=True)
+        stats.update({k: int(v) for k, v in row.items()})
+        return stats
+    
+    for key, col in columns.items():
+        stats[key] = sum(s.count('|') + 1 for s in df[col].dropna())
+    
+    if has_sellers:
+        stats['unique_sellers'] = count_unique_tokens(df['Sellers'])
+    
+    return stats
+
+
+def _first_order_ids(df: pd.DataFrame) -> pd.Series:
+    """First '|'-separated order ID of each row, as strings"""
+    return df['Order IDs'].astype(str).str.partition('|')[0]
+
+
+@dataclass
+class AnalyticsContext:
+    """
+    Column scans shared by duplicate detection and analytics
+    
+    Build once with from_frame() after the dataframe is in its final row
+    order, then pass it to the DuplicateDetector/OrderAnalytics methods so
+    they reuse these values instead of re-scanning the columns.
+    """
+    first_order_ids: Optional[pd.Series] = None
+    status_counts: Optional[pd.Series] = None
+    ai_used_mask: Optional[np.ndarray] = None
+    token_stats: Dict = field(default_factory=dict)
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'AnalyticsContext':
+        """
+        Scan each relevant column of the dataframe once
+        
+        Args:
+            df: DataFrame with extracted order data
+        
+        Returns:
+            AnalyticsContext aligned with df's rows
+        """
+        return cls(
+            first_order_ids=_first_order_ids(df) if 'Order IDs' in df.columns else None,
+            status_counts=df['Status'].value_counts() if 'Status' in df.columns else None,
+            ai_used_mask=(df['AI Used'] == 'Yes').to_numpy() if 'AI Used' in df.columns else None,
+            token_stats=_token_stats(df),
+        )
+
 
 class OrderAnalytics(LoggerMixin):
     """Generate analytics from extracted order data"""
     
     @staticmethod
-    def generate_summary(df: pd.DataFrame) -> Dict:
+    def generate_summary(df: pd.DataFrame, context: Optional[AnalyticsContext] = None) -> Dict:
         """
         Generate summary statistics
         
         Args:
             df: DataFrame with extracted order data
+            context: Precomputed column scans for df (optional)
         
         Returns:
             Dictionary with summary statistics
@@ -43,108 +236,101 @@ class OrderAnalytics(LoggerMixin):
         
         # Status counts
         if 'Status' in df.columns:
-            summary['successful_extractions'] = df['Status'].str.contains('Success', case=False, na=False).sum()
-            summary['review_required'] = df['Status'].str.contains('Review', case=False, na=False).sum()
+            # Count each distinct status once, then classify the labels
+            counts = context.status_counts if context is not None else df['Status'].value_counts()
+            labels = counts.index.astype(str).str.lower()
+            summary['successful_extractions'] = int(counts[labels.str.contains('success', regex=False)].sum())
+            summary['review_required'] = int(counts[labels.str.contains('review', regex=False)].sum())
             summary['failed_extractions'] = len(df) - summary['successful_extractions'] - summary['review_required']
         
         # AI usage
         if 'AI Used' in df.columns:
-            summary['ai_used_count'] = (df['AI Used'] == 'Yes').sum()
+            ai_mask = context.ai_used_mask if context is not None else (df['AI Used'] == 'Yes')
+            summary['ai_used_count'] = ai_mask.sum()
             summary['ai_usage_rate'] = (summary['ai_used_count'] / len(df)) * 100
         
         # Confidence
         if 'Tesseract Confidence (%)' in df.columns:
             summary['avg_confidence'] = df['Tesseract Confidence (%)'].mean()
         
-        # Orders
-        if 'Order IDs' in df.columns:
-            order_counts = df['Order IDs'].str.split('|').str.len()
-            summary['total_orders'] = order_counts.sum()
-        
-        # Items
-        if 'Items' in df.columns:
-            item_counts = df['Items'].str.split('|').str.len()
-            summary['total_items'] = item_counts.sum()
-            if summary['total_orders'] > 0:
-                summary['avg_items_per_order'] = summary['total_items'] / summary['total_orders']
-        
-        # Sellers
-        if 'Sellers' in df.columns:
-            all_sellers = df['Sellers'].str.split('|').dropna()
-            unique_sellers = set()
-            for sellers in all_sellers:
-                unique_sellers.update(sellers)
-            summary['unique_sellers'] = len(unique_sellers)
+        # Orders, items and sellers
+        summary.update(context.token_stats if context is not None else _token_stats(df))
+        if summary['total_orders'] > 0:
+            summary['avg_items_per_order'] = summary['total_items'] / summary['total_orders']
         
         return summary
     
     @staticmethod
-    def generate_text_report(df: pd.DataFrame, summary: Dict) -> str:
+    def generate_text_report(df: pd.DataFrame, summary: Dict,
+                             context: Optional[AnalyticsContext] = None) -> str:
         """
         Generate a text summary report
         
         Args:
             df: DataFrame with extracted order data
             summary: Summary statistics dictionary
+            context: Precomputed column scans for df (optional)
         
         Returns:
             Formatted text report
         """
-        report = []
-        report.append("=" * 60)
-        report.append("  🐱 MEOWZON EXTRACTION REPORT")
-        report.append("=" * 60)
-        report.append("")
-        
-        # Overview
-        report.append("📊 OVERVIEW")
-        report.append("-" * 60)
-        report.append(f"Total Files Processed: {summary['total_files']}")
-        report.append(f"Successful Extractions: {summary['successful_extractions']} "
-                     f"({summary['successful_extractions']/summary['total_files']*100:.1f}%)")
-        report.append(f"Review Required: {summary['review_required']}")
-        report.append(f"Failed: {summary['failed_extractions']}")
-        report.append("")
-        
-        # AI Usage
-        report.append("🤖 AI USAGE")
-        report.append("-" * 60)
-        report.append(f"AI Used: {summary['ai_used_count']} files ({summary['ai_usage_rate']:.1f}%)")
-        report.append(f"Average OCR Confidence: {summary['avg_confidence']:.1f}%")
-        report.append("")
-        
-        # Order Data
-        report.append("📦 ORDER DATA")
-        report.append("-" * 60)
-        report.append(f"Total Orders Found: {summary['total_orders']}")
-        report.append(f"Total Items Found: {summary['total_items']}")
-        report.append(f"Avg Items per Order: {summary['avg_items_per_order']:.1f}")
-        report.append(f"Unique Sellers: {summary['unique_sellers']}")
-        report.append("")
+        rule = "=" * 60
+        divider = "-" * 60
+        total_files = summary['total_files']
+        success_rate = (
+            summary['successful_extractions'] / total_files * 100 if total_files else 0.0
+        )
+        
+        # Overview, AI usage and order data
+        sections = [f"""{rule}
+  🐱 MEOWZON EXTRACTION REPORT
+{rule}
+
+📊 OVERVIEW
+{divider}
+Total Files Processed: {total_files}
+Successful Extractions: {summary['successful_extractions']} ({success_rate:.1f}%)
+Review Required: {summary['review_required']}
+Failed: {summary['failed_extractions']}
+
+🤖 AI USAGE
+{divider}
+AI Used: {summary['ai_used_count']} files ({summary['ai_usage_rate']:.1f}%)
+Average OCR Confidence: {summary['avg_confidence']:.1f}%
+
+📦 ORDER DATA
+{divider}
+Total Orders Found: {summary['total_orders']}
+Total Items Found: {summary['total_items']}
+Avg Items per Order: {summary['avg_items_per_order']:.1f}
+Unique Sellers: {summary['unique_sellers']}
+
+"""]
         
         # Crop strategies
         if 'Crop Used' in df.columns:
-            report.append("✂️ CROP STRATEGIES")
-            report.append("-" * 60)
             crop_counts = df['Crop Used'].value_counts()
-            for crop, count in crop_counts.items():
-                report.append(f"  {crop}: {count} ({count/len(df)*100:.1f}%)")
-            report.append("")
+            crop_lines = "".join(
+                f"  {crop}: {count} ({count/len(df)*100:.1f}%)\n"
+                for crop, count in crop_counts.items()
+            )
+            sections.append(f"✂️ CROP STRATEGIES\n{divider}\n{crop_lines}\n")
         
         # AI providers
         if 'AI Provider' in df.columns:
-            ai_df = df[df['AI Used'] == 'Yes']
+            ai_mask = context.ai_used_mask if context is not None else (df['AI Used'] == 'Yes')
+            ai_df = df[ai_mask]
             if len(ai_df) > 0:
-                report.append("🔮 AI PROVIDERS")
-                report.append("-" * 60)
                 provider_counts = ai_df['AI Provider'].value_counts()
-                for provider, count in provider_counts.items():
-                    report.append(f"  {provider}: {count}")
-                report.append("")
+                provider_counts = provider_counts[provider_counts > 0]
+                provider_lines = "".join(
+                    f"  {provider}: {count}\n" for provider, count in provider_counts.items()
+                )
+                sections.append(f"🔮 AI PROVIDERS\n{divider}\n{provider_lines}\n")
         
-        report.append("=" * 60)
+        sections.append(rule)
         
-        return "\n".join(report)
+        return "".join(sections)
     
     @staticmethod
     def plot_statistics(df: pd.DataFrame, output_path: str):
@@ -154,6 +340,9 @@ class OrderAnalytics(LoggerMixin):
         Args:
             df: DataFrame with extracted order data
             output_path: Path to save plot image
+        
+        Returns:
+            Path to the saved plot image
         """
         try:
             import matplotlib.pyplot as plt
@@ -189,12 +378,16 @@ class OrderAnalytics(LoggerMixin):
         # 3. Status distribution
         if 'Status' in df.columns:
             # Simplify status for plotting
-            status_simple = df['Status'].apply(lambda x: 
-                'Success' if 'Success' in str(x) else
-                'Review' if 'Review' in str(x) else
-                'Failed'
-            )
+            status = df['Status'].astype(str)
+            status_simple = pd.Series(pd.Categorical(
+                np.where(
+                    status.str.contains('Success', regex=False, na=False), 'Success',
+                    np.where(status.str.contains('Review', regex=False, na=False), 'Review', 'Failed')
+                ),
+                categories=['Success', 'Review', 'Failed']
+            ))
             status_counts = status_simple.value_counts()
+            status_counts = status_counts[status_counts > 0]
             colors_status = {'Success': '#90EE90', 'Review': '#FFD700', 'Failed': '#FFB6C1'}
             axes[1, 0].bar(status_counts.index, status_counts.values,
                           color=[colors_status.get(s, 'gray') for s in status_counts.index])
@@ -212,20 +405,23 @@ class OrderAnalytics(LoggerMixin):
                 axes[1, 1].invert_yaxis()
         
         plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=150)
         plt.close()
+        
+        return output_path
 
 
 class DuplicateDetector(LoggerMixin):
     """Detect and handle duplicate orders"""
     
     @staticmethod
-    def find_duplicates(df: pd.DataFrame) -> pd.DataFrame:
+    def find_duplicates(df: pd.DataFrame, context: Optional[AnalyticsContext] = None) -> pd.DataFrame:
         """
         Flag duplicate orders in dataframe
         
         Args:
             df: DataFrame with order data
+            context: Precomputed column scans for df (optional)
         
         Returns:
             DataFrame with is_duplicate column added
@@ -234,8 +430,25 @@ class DuplicateDetector(LoggerMixin):
             df['is_duplicate'] = False
             return df
         
+        if context is not None and context.first_order_ids is not None:
+            # Mark duplicates of the precomputed first order ID (keep first occurrence)
+            df['is_duplicate'] = context.first_order_ids.duplicated(keep='first').to_numpy()
+            return df
+        
+        if pl is not None:
+            # Mark duplicates of the first order ID (keep first occurrence)
+            first_id = pl.col('Order IDs').cast(pl.Utf8).str.split_exact('|', 1).struct.field('field_0')
+            df['is_duplicate'] = (
+                _pl(df, ['Order IDs'])
+                .select(~first_id.is_first_distinct())
+                .collect()
+                .to_series()
+                .to_numpy()
+            )
+            return df
+        
         # Create a column with first order ID
-        df['_first_order_id'] = df['Order IDs'].str.split('|').str[0]
+        df['_first_order_id'] = df['Order IDs'].str.partition('|')[0]
         
         # Mark duplicates (keep first occurrence)
         df['is_duplicate'] = df.duplicated(subset=['_first_order_id'], keep='first')
@@ -246,12 +459,14 @@ class DuplicateDetector(LoggerMixin):
         return df
     
     @staticmethod
-    def get_duplicate_groups(df: pd.DataFrame) -> Dict[str, List[str]]:
+    def get_duplicate_groups(df: pd.DataFrame,
+                             context: Optional[AnalyticsContext] = None) -> Dict[str, List[str]]:
         """
         Get groups of duplicate files by order ID
         
         Args:
             df: DataFrame with order data
+            context: Precomputed column scans for df (optional)
         
         Returns:
             Dictionary mapping order_id -> list of filenames
@@ -259,20 +474,22 @@ class DuplicateDetector(LoggerMixin):
         if 'Order IDs' not in df.columns or 'File Name' not in df.columns:
             return {}
         
-        duplicates = {}
-        
-        for _, row in df.iterrows():
-            order_ids = str(row['Order IDs']).split('|')
-            if order_ids and order_ids[0] and order_ids[0] != 'nan':
-                order_id = order_ids[0].strip()
-                if order_id not in duplicates:
-                    duplicates[order_id] = []
-                duplicates[order_id].append(row['File Name'])
-        
+        # First order ID per row, skipping empty and missing values
+        if context is not None and context.first_order_ids is not None:
+            first_ids = context.first_order_ids
+        else:
+            first_ids = _first_order_ids(df)
+        order_ids = first_ids[(first_ids != '') & (first_ids != 'nan')].str.strip()
+
         # Keep only actual duplicates (more than one file)
-        duplicates = {k: v for k, v in duplicates.items() if len(v) > 1}
-        
-        return duplicates
+        order_ids = order_ids[order_ids.duplicated(keep=False)]
+
+        return (
+            df.loc[order_ids.index, 'File Name']
+            .groupby(order_ids, sort=False)
+            .agg(list)
+            .to_dict()
+        )
     
     @staticmethod
     def merge_duplicates(df: pd.DataFrame) -> pd.DataFrame:
@@ -289,32 +506,24 @@ class DuplicateDetector(LoggerMixin):
             return df
         
         # Get first order ID for grouping
-        df['_first_order_id'] = df['Order IDs'].str.split('|').str[0]
-        
-        # Group by order ID
-        grouped = df.groupby('_first_order_id')
-        
-        merged_rows = []
-        
-        for order_id, group in grouped:
-            if len(group) == 1:
-                # No duplicates, keep as is
-                merged_rows.append(group.iloc[0])
-            else:
-                # Merge duplicates - keep row with highest confidence
-                if 'Tesseract Confidence (%)' in group.columns:
-                    best_row = group.loc[group['Tesseract Confidence (%)'].idxmax()]
-                else:
-                    best_row = group.iloc[0]
-                
-                # Merge file names
-                filenames = ' + '.join(group['File Name'].tolist())
-                best_row['File Name'] = filenames
-                best_row['is_duplicate'] = True
-                
-                merged_rows.append(best_row)
-        
-        result = pd.DataFrame(merged_rows)
-        result.drop('_first_order_id', axis=1, inplace=True, errors='ignore')
+        first_ids = df['Order IDs'].str.partition('|')[0]
+        
+        # Pick one row per order ID - the highest confidence one, if known
+        if 'Tesseract Confidence (%)' in df.columns:
+            best_idx = df['Tesseract Confidence (%)'].fillna(-np.inf).groupby(first_ids).idxmax()
+        else:
+            best_idx = df.index.to_series().groupby(first_ids).first()
+        
+        result = df.loc[best_idx.to_numpy()].copy()
+        
+        # Merge file names and flag merged groups
+        file_names = df['File Name'].groupby(first_ids)
+        is_merged = (file_names.size() > 1).to_numpy()
+        result['File Name'] = file_names.agg(' + '.join).to_numpy()
+        
+        if 'is_duplicate' in result.columns:
+            result['is_duplicate'] = result['is_duplicate'].where(~is_merged, True)
+        else:
+            result['is_duplicate'] = is_merged
         
         return result.reset_index(drop=True)
@@ -0,0 +1,109 @@
+"""
+Content hashing and the SQLite store shared by the result caches
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from .logging_utils import LoggerMixin
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+def image_digest(image: Union[str, bytes]) -> bytes:
+    """
+    Hash an image's content (blake3 when installed, else SHA-256)
+    
+    Args:
+        image: Path to image file, or encoded image bytes
+    
+    Returns:
+        Raw digest bytes
+    """
+    if not isinstance(image, bytes):
+        with open(image, "rb") as f:
+            image = f.read()
+    
+    if blake3 is not None:
+        return blake3.blake3(image).digest()
+    return hashlib.sha256(image).digest()
+
+
+class SQLiteStore(LoggerMixin):
+    """
+    Lazily opened, thread-safe SQLite table that never raises on I/O errors
+    
+    Subclasses set TABLE, SCHEMA (its CREATE TABLE statement, with a ts
+    column) and LABEL (used in warnings) and build their get/put on
+    _fetchone and _write. Rows past max_age_days, and all but the newest
+    max_entries, are evicted when the database is opened.
+    """
+    
+    TABLE = ""
+    SCHEMA = ""
+    LABEL = "Cache"
+    
+    def __init__(self, path: str, max_age_days: int = 0, max_entries: int = 0):
+        self.path = os.path.expanduser(path)
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self._conn = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (each worker process opens its own)"""
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            # Other processes may share the file; wait for their write locks
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(self.SCHEMA)
+            self._evict(self._conn)
+            self._conn.commit()
+        return self._conn
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete rows that are too old or beyond the newest max_entries"""
+        if self.max_age_days > 0:
+            cutoff = time.time() - self.max_age_days * 86400
+            conn.execute(f"DELETE FROM {self.TABLE} WHERE ts < ?", (cutoff,))
+        if self.max_entries > 0:
+            conn.execute(
+                f"DELETE FROM {self.TABLE} WHERE rowid IN ("
+                f"SELECT rowid FROM {self.TABLE} ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+    
+    def _fetchone(self, sql: str, params: tuple) -> Optional[Tuple]:
+        """Run a query and return its first row, or None on a miss or error"""
+        try:
+            with self._lock:
+                return self._connect().execute(sql, params).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"{self.LABEL} read failed: {e}")
+            return None
+    
+    def _write(self, sql: str, params: tuple):
+        """Run and commit a write (failures are logged and ignored)"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(sql, params)
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"{self.LABEL} write failed: {e}")
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
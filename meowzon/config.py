@@ -4,9 +4,29 @@ Configuration management for Meowzon OCR Extractor
 
 from dataclasses import dataclass, field
 from typing import List, Optional
+import copy
+import functools
 import yaml
 import os
 
+# libyaml C bindings when PyYAML was built with them (same output, much faster)
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+
+@functools.lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """
+    Parse a YAML file once per (path, mtime, size)
+    
+    Editing the file changes the key, so stale entries are never returned.
+    Callers must copy the result before mutating it.
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
 
 @dataclass
 class ExtractorConfig:
@@ -32,16 +52,27 @@ class ExtractorConfig:
     gemini_model: str = "gemini-1.5-flash"
     ai_max_retries: int = 3
     ai_timeout: int = 30
+    ai_batch_size: int = 1  # Images per AI request (1 = one request per file, inline)
+    ai_max_image_side: int = 1568  # Downscale uploads to this long edge (0 = original size)
+    enable_ai_cache: bool = True  # Reuse AI results for screenshots seen before
+    ai_cache_file: str = "~/.cache/meowzon/ai_cache.db"
     
     # OCR Configuration
     tesseract_confidence_threshold: float = 70.0
     tesseract_config: str = '--psm 6 --oem 3'
     upscale_factor: float = 2.0
+    ocr_threshold_method: str = "mean"  # mean (box filter, faster) or gaussian
+    auto_scale_text: bool = True  # Scale so the median glyph is ~32 px (0.25x to 3x) instead of by upscale_factor
+    enable_ocr_cache: bool = True  # Reuse Tesseract results for images OCR'd before
+    ocr_cache_file: str = "~/.cache/meowzon/ocr_cache.db"
+    cache_max_age_days: int = 90  # Drop cached AI/OCR results older than this (0 = keep forever)
+    cache_max_entries: int = 100000  # Newest results kept per cache file (0 = unlimited)
     
     # Image Processing
     max_image_size_mb: int = 50
     save_enhanced_images: bool = True
     enhanced_images_folder: str = "meowzon_enhanced_images"
+    background_removal_method: str = "mean"  # mean (box filter, faster) or gaussian
     
     # Cropping Strategies
     crop_strategies: List[dict] = field(default_factory=lambda: [
@@ -74,10 +105,11 @@ class ExtractorConfig:
         if not os.path.exists(path):
             raise FileNotFoundError(f"Config file not found: {path}")
         
-        with open(path, 'r') as f:
-            data = yaml.safe_load(f)
+        stat = os.stat(path)
+        data = _load_yaml_cached(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
         
-        return cls(**data)
+        # Deep copy so configs never share the cached lists (crop_strategies)
+        return cls(**copy.deepcopy(data))
     
     def to_yaml(self, path: str):
         """Save configuration to YAML file"""
@@ -88,7 +120,7 @@ class ExtractorConfig:
         }
         
         with open(path, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
     
     @classmethod
     def from_args(cls, args) -> 'ExtractorConfig':
@@ -102,10 +134,11 @@ class ExtractorConfig:
             ai_provider=args.ai_provider,
             ollama_model=args.ollama_model,
             openai_model=args.openai_model,
+            ai_batch_size=args.ai_batch_size,
             parallel_processing=args.parallel,
             max_workers=args.workers,
             enable_interactive_review=args.interactive,
-            generate_plots=args.plot,
+            generate_plots=not args.no_plot,
             tesseract_confidence_threshold=args.confidence_threshold,
         )
     
@@ -117,6 +150,21 @@ class ExtractorConfig:
         if self.ai_provider not in ['ollama', 'openai', 'claude', 'gemini']:
             raise ValueError(f"Invalid ai_provider: {self.ai_provider}")
         
+        if self.ai_batch_size < 1:
+            raise ValueError("ai_batch_size must be at least 1")
+        
+        if self.ai_max_image_side < 0:
+            raise ValueError("ai_max_image_side must be 0 or positive")
+        
+        if self.cache_max_age_days < 0 or self.cache_max_entries < 0:
+            raise ValueError("cache_max_age_days and cache_max_entries must be 0 or positive")
+        
+        if self.background_removal_method not in ['mean', 'gaussian']:
+            raise ValueError(f"Invalid background_removal_method: {self.background_removal_method}")
+        
+        if self.ocr_threshold_method not in ['mean', 'gaussian']:
+            raise ValueError(f"Invalid ocr_threshold_method: {self.ocr_threshold_method}")
+        
         if self.output_format not in ['csv', 'excel', 'json', 'html', 'all']:
             raise ValueError(f"Invalid output_format: {self.output_format}")
         
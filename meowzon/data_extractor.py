@@ -2,74 +2,93 @@
 Data extraction utilities for parsing OCR text
 """
 
+import functools
 import re
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 
 
+@functools.lru_cache(maxsize=4096)
+def _normalize_date(date_str: str) -> str:
+    """Reformat a matched date as YYYY-MM-DD, or return it unchanged if unparseable"""
+    try:
+        parsed = datetime.strptime(date_str.replace(',', ''), '%b %d %Y')
+    except ValueError:
+        return date_str
+    return parsed.strftime('%Y-%m-%d')
+
+
 class DataExtractor:
     """Extract structured data from OCR text using regex patterns"""
     
-    # Regex patterns
-    ORDER_ID_PATTERN = r'\d{3}-\d{7}-\d{7}'
-    PRICE_PATTERN = r'\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?'
-    DATE_PATTERN = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}'
-    TOTAL_PATTERN = r'(?:Order Total|Grand Total|Total|Subtotal)[\s:]*(\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-    QUANTITY_PATTERN = r'(?:Qty|Quantity)[\.:]?\s*(\d+)'
-    SELLER_PATTERN = r'Sold by[:\s]*(.+?)(?:\n|$)'
-    TRACKING_PATTERN = r'(?:Tracking|Track)[:\s]*([A-Z0-9]{10,})'
+    # Regex patterns (compiled once at import time). The (?=[...]) lookaheads are a
+    # first-letter guard so positions that cannot start a keyword skip the alternation.
+    ORDER_ID_PATTERN = re.compile(r'\d{3}-\d{7}-\d{7}')
+    PRICE_PATTERN = re.compile(r'\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?')
+    DATE_PATTERN = re.compile(
+        r'(?=[jfmasond])(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}',
+        re.IGNORECASE
+    )
+    TOTAL_PATTERN = re.compile(
+        r'(?=[gost])(?:Order Total|Grand Total|Total|Subtotal)[\s:]*(\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
+        re.IGNORECASE
+    )
+    QUANTITY_PATTERN = re.compile(r'(?:Qty|Quantity)[\.:]?\s*(\d+)', re.IGNORECASE)
+    SELLER_PATTERN = re.compile(r'Sold by[:\s]*(.+?)(?:\n|$)')
+    TRACKING_PATTERN = re.compile(r'(?:Tracking|Track)[:\s]*([A-Z0-9]{10,})', re.IGNORECASE)
+    # Prices and order IDs stripped from candidate item lines
+    ITEM_NOISE_PATTERN = re.compile(r'\$[\d,]+\.?\d*|\d{3}-\d{7}.*')
+    # Lines mentioning any of these (as substrings, matched on lowercased text) are not items
+    SKIP_KEYWORDS = (
+        'total', 'shipping', 'tax', 'qty', 'quantity', 'sold by',
+        'order', 'delivery', 'arrives', 'return', 'refund',
+        'customer', 'account', 'payment', 'credit', 'gift'
+    )
+    SKIP_KEYWORD_PATTERN = re.compile('|'.join(map(re.escape, SKIP_KEYWORDS)))
     
     @staticmethod
     def extract_order_ids(text: str) -> List[str]:
         """Extract Amazon order IDs (format: XXX-XXXXXXX-XXXXXXX)"""
-        order_ids = re.findall(DataExtractor.ORDER_ID_PATTERN, text)
-        return list(set(order_ids))  # Remove duplicates
+        order_ids = DataExtractor.ORDER_ID_PATTERN.findall(text)
+        return list(dict.fromkeys(order_ids))  # Remove duplicates, keep text order
     
     @staticmethod
     def extract_prices(text: str) -> List[str]:
         """Extract all price values"""
-        return re.findall(DataExtractor.PRICE_PATTERN, text)
+        return DataExtractor.PRICE_PATTERN.findall(text)
     
     @staticmethod
     def extract_dates(text: str) -> List[str]:
         """Extract dates in various formats"""
-        dates = re.findall(DataExtractor.DATE_PATTERN, text, re.IGNORECASE)
-        # Normalize dates
-        normalized = []
-        for date_str in dates:
-            try:
-                # Try to parse and reformat
-                parsed = datetime.strptime(date_str.replace(',', ''), '%b %d %Y')
-                normalized.append(parsed.strftime('%Y-%m-%d'))
-            except:
-                normalized.append(date_str)
-        return normalized
+        dates = DataExtractor.DATE_PATTERN.findall(text)
+        # Normalize dates (the same few dates recur across an order history)
+        return [_normalize_date(date_str) for date_str in dates]
     
     @staticmethod
     def extract_totals(text: str) -> List[str]:
         """Extract order total amounts"""
-        totals = re.findall(DataExtractor.TOTAL_PATTERN, text, re.IGNORECASE)
+        totals = DataExtractor.TOTAL_PATTERN.findall(text)
         return totals
     
     @staticmethod
     def extract_quantities(text: str) -> List[str]:
         """Extract item quantities"""
-        quantities = re.findall(DataExtractor.QUANTITY_PATTERN, text, re.IGNORECASE)
+        quantities = DataExtractor.QUANTITY_PATTERN.findall(text)
         return quantities
     
     @staticmethod
     def extract_sellers(text: str) -> List[str]:
         """Extract seller names"""
-        sellers = re.findall(DataExtractor.SELLER_PATTERN, text)
-        # Clean up seller names
-        cleaned = [s.strip() for s in sellers if len(s.strip()) > 2]
-        return list(set(cleaned))
+        sellers = DataExtractor.SELLER_PATTERN.findall(text)
+        # Clean up seller names (deduplicated, in text order)
+        cleaned = dict.fromkeys(s.strip() for s in sellers)
+        return [s for s in cleaned if len(s) > 2]
     
     @staticmethod
     def extract_tracking_numbers(text: str) -> List[str]:
         """Extract tracking numbers"""
-        tracking = re.findall(DataExtractor.TRACKING_PATTERN, text, re.IGNORECASE)
-        return list(set(tracking))
+        tracking = DataExtractor.TRACKING_PATTERN.findall(text)
+        return list(dict.fromkeys(tracking))
     
     @staticmethod
     def extract_items(text: str) -> List[str]:
@@ -77,39 +96,22 @@ class DataExtractor:
         Extract item names from text using heuristics
         Looks for lines that likely represent product names
         """
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        # Remove prices and order IDs (neither pattern crosses a line break)
+        cleaned_text = DataExtractor.ITEM_NOISE_PATTERN.sub('', text)
         
-        items = []
-        for line in lines:
-            # Remove prices and order IDs from line
-            clean = re.sub(r'\$[\d,]+\.?\d*|\d{3}-\d{7}.*', '', line).strip()
+        items = {}  # Insertion-ordered, drops duplicates
+        for line in cleaned_text.split('\n'):
+            clean = line.strip()
             
             # Skip if line is too short or contains common non-item keywords
-            if len(clean) < 15:
-                continue
-            
-            skip_keywords = [
-                'total', 'shipping', 'tax', 'qty', 'quantity', 'sold by',
-                'order', 'delivery', 'arrives', 'return', 'refund',
-                'customer', 'account', 'payment', 'credit', 'gift'
-            ]
-            
-            if any(keyword in clean.lower() for keyword in skip_keywords):
+            if len(clean) < 15 or DataExtractor.SKIP_KEYWORD_PATTERN.search(clean.lower()):
                 continue
             
             # Should start with capital letter (product names typically do)
-            if clean and clean[0].isupper():
-                items.append(clean)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_items = []
-        for item in items:
-            if item not in seen:
-                seen.add(item)
-                unique_items.append(item)
+            if clean[0].isupper():
+                items[clean] = None
         
-        return unique_items
+        return list(items)
     
     @staticmethod
     def extract_all(text: str) -> Dict[str, List[str]]:
@@ -119,14 +121,21 @@ class DataExtractor:
         Returns:
             Dictionary with all extracted data
         """
+        # Skip patterns whose required literal is absent (fast substring scans;
+        # garbled crops often have no '$' or '-' at all)
+        has_dollar = '$' in text
+        lowered = text.lower()
+        
         return {
-            'order_ids': DataExtractor.extract_order_ids(text),
-            'prices': DataExtractor.extract_prices(text),
+            'order_ids': DataExtractor.extract_order_ids(text) if '-' in text else [],
+            'prices': DataExtractor.extract_prices(text) if has_dollar else [],
             'dates': DataExtractor.extract_dates(text),
-            'totals': DataExtractor.extract_totals(text),
-            'quantities': DataExtractor.extract_quantities(text),
-            'sellers': DataExtractor.extract_sellers(text),
-            'tracking_numbers': DataExtractor.extract_tracking_numbers(text),
+            'totals': DataExtractor.extract_totals(text) if has_dollar else [],
+            'quantities': DataExtractor.extract_quantities(text) if 'q' in lowered else [],
+            'sellers': DataExtractor.extract_sellers(text) if 'Sold by' in text else [],
+            'tracking_numbers': (
+                DataExtractor.extract_tracking_numbers(text) if 'track' in lowered else []
+            ),
             'items': DataExtractor.extract_items(text),
         }
 
@@ -134,19 +143,23 @@ class DataExtractor:
 class DataValidator:
     """Validate extracted data"""
     
+    # Whole-string formats (compiled once at import time)
+    ORDER_ID_FORMAT = re.compile(r'^\d{3}-\d{7}-\d{7}$')
+    PRICE_FORMAT = re.compile(r'^\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?$')
+    
     @staticmethod
     def validate_order_id(order_id: str) -> bool:
         """Validate Amazon order ID format (XXX-XXXXXXX-XXXXXXX)"""
         if not order_id:
             return False
-        return bool(re.match(r'^\d{3}-\d{7}-\d{7}$', order_id))
+        return DataValidator.ORDER_ID_FORMAT.match(order_id) is not None
     
     @staticmethod
     def validate_price(price: str) -> bool:
         """Validate price format ($X,XXX.XX)"""
         if not price:
             return False
-        return bool(re.match(r'^\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?$', price))
+        return DataValidator.PRICE_FORMAT.match(price) is not None
     
     @staticmethod
     def validate_date(date_str: str) -> bool:
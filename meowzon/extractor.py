@@ -2,23 +2,97 @@
 Main Meowzon extractor class
 """
 
+import asyncio
 import cv2
 import os
+import multiprocessing
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
-import tempfile
 
 from .config import ExtractorConfig
-from .logging_utils import LoggerMixin
+from .logging_utils import LoggerMixin, setup_logging
 from .ocr_engine import OCREngine, ImageValidator
 from .image_processor import ImageProcessor
 from .data_extractor import DataExtractor, DataValidator
-from .ai_providers import get_ai_provider
-from .analytics import OrderAnalytics, DuplicateDetector
+from .analytics import AnalyticsContext, OrderAnalytics, DuplicateDetector
 from .output_handler import OutputHandler, format_output_dataframe
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+# Image file extensions picked up from the input folder
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp'})
+
+# Fields produced by DataExtractor.extract_all and AIProvider._normalize_to_lists
+_MERGE_KEYS = (
+    'order_ids', 'prices', 'dates', 'totals',
+    'quantities', 'sellers', 'tracking_numbers', 'items',
+)
+
+# Result columns always produced by process_single_file, in output order
+_RESULT_COLUMNS = (
+    "File Name", "Status", "Overall Confidence", "AI Used", "AI Provider",
+    "AI Status", "Tesseract Confidence (%)", "Crop Used", "Order IDs", "Dates",
+    "Totals", "Items", "Quantities", "Sellers", "Prices", "Tracking Numbers",
+)
+_FLOAT_COLUMNS = ["Overall Confidence", "Tesseract Confidence (%)"]
+_CATEGORY_COLUMNS = ["AI Used", "AI Provider", "Crop Used"]
+
+# Every status process_single_file and the batch runners can report
+_STATUS_CATEGORIES = ["Success", "Review Required", "Failed", "Failed Load", "Error"]
+
+# Low-effort encoder settings for the enhanced (debug) images
+_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+# JPEG settings for images uploaded to AI providers
+_AI_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+_IMWRITE_PARAMS = {
+    '.png': [cv2.IMWRITE_PNG_COMPRESSION, 1, cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_RLE],
+    '.jpg': _JPEG_PARAMS,
+    '.jpeg': _JPEG_PARAMS,
+}
+
+
+def _run_async(coro):
+    """Run a coroutine to completion on uvloop when installed, else asyncio's loop"""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+# Extractor owned by the current worker process (see _process_parallel)
+_worker_extractor: Optional['MeowzonExtractor'] = None
+
+
+def _init_worker(config: ExtractorConfig):
+    """
+    Build the per-process extractor when a worker process starts
+    
+    The OCR engine, image processor and AI provider are not picklable,
+    so each worker pays their startup cost (Tesseract probe, AI client)
+    once here instead of per file.
+    
+    Args:
+        config: Extractor configuration
+    """
+    global _worker_extractor
+    
+    setup_logging(
+        log_file=config.log_file if config.enable_logging else None,
+        log_level=config.log_level,
+        enable_file_logging=config.enable_logging
+    )
+    _worker_extractor = MeowzonExtractor(config)
+
+
+def _process_file_in_worker(file_path: str, defer_ai: bool = False) -> Dict:
+    """Process a single file with the current worker's extractor"""
+    return _worker_extractor.process_single_file(file_path, defer_ai=defer_ai)
+
 
 class MeowzonExtractor(LoggerMixin):
     """Main orchestrator for order extraction"""
@@ -35,6 +109,8 @@ class MeowzonExtractor(LoggerMixin):
         self.ai_processor = None
         if config.ai_mode != 'never':
             try:
+                # Imported here so Tesseract-only runs skip the HTTP/SDK stack
+                from .ai_providers import get_ai_provider
                 self.ai_processor = get_ai_provider(config)
                 self.logger.info(f"AI provider initialized: {config.ai_provider}")
             except Exception as e:
@@ -46,12 +122,14 @@ class MeowzonExtractor(LoggerMixin):
         if config.save_enhanced_images:
             Path(config.enhanced_images_folder).mkdir(parents=True, exist_ok=True)
     
-    def process_single_file(self, file_path: str) -> Dict:
+    def process_single_file(self, file_path: str, defer_ai: bool = False) -> Dict:
         """
         Process a single image file
         
         Args:
             file_path: Path to image file
+            defer_ai: Leave the AI call to a later batch; the result then
+                carries the pending work under '_ai_stage'
         
         Returns:
             Dictionary with extraction results
@@ -83,40 +161,104 @@ class MeowzonExtractor(LoggerMixin):
         # Extract data from OCR text
         extracted = self.data_extractor.extract_all(ocr_text)
         
+        has_order = bool(extracted.get('order_ids'))
+        has_items = bool(extracted.get('items'))
+        
         # Determine if AI should be used
-        use_ai = self._should_use_ai(extracted, ocr_conf)
+        use_ai = self._should_use_ai(has_order, has_items, ocr_conf)
         
-        ai_used = False
-        ai_provider = ""
+        # Save enhanced images if requested
+        cropped_file = ""
+        processed_file = ""
+        
+        if self.config.save_enhanced_images:
+            base_name = Path(filename).stem
+            ext = Path(filename).suffix
+            
+            # Save cropped color image
+            if crop_name != "Full Image":
+                safe_crop = crop_name.replace(' ', '_')
+                cropped_file = f"{base_name}_cropped_{safe_crop}{ext}"
+                cropped_path = Path(self.config.enhanced_images_folder) / cropped_file
+                self._save_image(cropped_path, best_color)
+            
+            # Save processed grayscale image
+            processed_file = f"{base_name}_processed{ext}"
+            processed_path = Path(self.config.enhanced_images_folder) / processed_file
+            self._save_image(processed_path, best_processed)
+        
+        # Everything needed to finish the result once AI has (or hasn't) run
+        stage = {
+            "filename": filename,
+            "ocr_text": ocr_text,
+            "ocr_conf": ocr_conf,
+            "crop_name": crop_name,
+            "extracted": extracted,
+            "cropped_file": cropped_file,
+            "processed_file": processed_file,
+        }
+        
+        ai_data = None
         ai_status = ""
         
         # Use AI if determined
         if use_ai and self.ai_processor:
             self.logger.debug(f"{filename}: Using AI ({self.config.ai_provider})")
             
-            # Save temporary image for AI
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
-                cv2.imwrite(tmp.name, best_color)
-                temp_path = tmp.name
+            # Encode image for AI in memory (no temp file round-trip)
+            ai_image = self._encode_for_ai(best_color, self.config.ai_max_image_side)
             
-            try:
-                ai_data, ai_status = self.ai_processor.extract(temp_path)
-                
-                if ai_data:
-                    # Merge AI results with OCR results (prefer AI)
-                    extracted = self._merge_results(extracted, ai_data)
-                    ai_used = True
-                    ai_provider = self.config.ai_provider
-                    self.logger.info(f"{filename}: AI extraction successful")
-                else:
-                    self.logger.warning(f"{filename}: AI extraction failed - {ai_status}")
-            
-            finally:
-                # Clean up temp file
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+            if ai_image is None:
+                ai_status = "Image Encode Failed"
+            elif defer_ai:
+                # Finish without AI for now; the batch pass redoes the result
+                result = self._finish_result(stage, None, "")
+                stage["ai_image"] = ai_image
+                result["_ai_stage"] = stage
+                return result
+            else:
+                ai_data, ai_status = self.ai_processor.extract(ai_image)
+        
+        return self._finish_result(stage, ai_data, ai_status)
+    
+    def _finish_result(
+        self,
+        stage: Dict,
+        ai_data: Optional[Dict[str, List[str]]],
+        ai_status: str
+    ) -> Dict:
+        """
+        Merge AI output into the OCR data and build the result row
+        
+        Args:
+            stage: OCR-stage values from process_single_file
+            ai_data: Normalized AI data, or None if AI was not used or failed
+            ai_status: AI status message
+        
+        Returns:
+            Dictionary with extraction results
+        """
+        filename = stage["filename"]
+        ocr_text = stage["ocr_text"]
+        ocr_conf = stage["ocr_conf"]
+        extracted = stage["extracted"]
+        
+        has_order = bool(extracted.get('order_ids'))
+        has_items = bool(extracted.get('items'))
+        
+        ai_used = False
+        ai_provider = ""
+        
+        if ai_data:
+            # Merge AI results with OCR results (prefer AI)
+            extracted = self._merge_results(extracted, ai_data)
+            has_order = bool(extracted['order_ids'])
+            has_items = bool(extracted['items'])
+            ai_used = True
+            ai_provider = self.config.ai_provider
+            self.logger.info(f"{filename}: AI extraction successful")
+        elif ai_status:
+            self.logger.warning(f"{filename}: AI extraction failed - {ai_status}")
         
         # Calculate confidence
         overall_confidence = self.data_validator.calculate_confidence(
@@ -127,33 +269,13 @@ class MeowzonExtractor(LoggerMixin):
         is_valid, issues = self.data_validator.validate_extraction(extracted)
         
         # Determine status
-        if extracted.get('order_ids'):
+        if has_order:
             status = "Success"
-        elif extracted.get('items'):
+        elif has_items:
             status = "Review Required"
         else:
             status = "Failed"
         
-        # Save enhanced images if requested
-        cropped_file = ""
-        processed_file = ""
-        
-        if self.config.save_enhanced_images:
-            base_name = Path(filename).stem
-            ext = Path(filename).suffix
-            
-            # Save cropped color image
-            if crop_name != "Full Image":
-                safe_crop = crop_name.replace(' ', '_')
-                cropped_file = f"{base_name}_cropped_{safe_crop}{ext}"
-                cropped_path = Path(self.config.enhanced_images_folder) / cropped_file
-                cv2.imwrite(str(cropped_path), best_color)
-            
-            # Save processed grayscale image
-            processed_file = f"{base_name}_processed{ext}"
-            processed_path = Path(self.config.enhanced_images_folder) / processed_file
-            cv2.imwrite(str(processed_path), best_processed)
-        
         # Build result dictionary
         result = {
             "File Name": filename,
@@ -163,7 +285,7 @@ class MeowzonExtractor(LoggerMixin):
             "AI Provider": ai_provider,
             "AI Status": ai_status,
             "Tesseract Confidence (%)": round(ocr_conf, 1),
-            "Crop Used": crop_name,
+            "Crop Used": stage["crop_name"],
             "Order IDs": " | ".join(extracted.get('order_ids', [])),
             "Dates": " | ".join(extracted.get('dates', [])),
             "Totals": " | ".join(extracted.get('totals', [])),
@@ -180,18 +302,94 @@ class MeowzonExtractor(LoggerMixin):
             result["Raw Tesseract Snippet"] = snippet
         
         if self.config.include_debug_info:
-            result["Cropped Image"] = cropped_file
-            result["Processed Image"] = processed_file
+            result["Cropped Image"] = stage["cropped_file"]
+            result["Processed Image"] = stage["processed_file"]
             result["Validation Issues"] = " | ".join(issues) if issues else ""
         
         return result
     
-    def _should_use_ai(self, extracted: Dict, ocr_conf: float) -> bool:
+    def _run_batched_ai(self, results: List[Dict]) -> List[Dict]:
+        """
+        Run deferred AI work in batches and finish those results
+        
+        Args:
+            results: Results from process_single_file(defer_ai=True)
+        
+        Returns:
+            Results with every deferred entry replaced by its final row
+        """
+        pending = [i for i, result in enumerate(results) if "_ai_stage" in result]
+        if not pending:
+            return results
+        
+        # Requests are network-bound, so parallel runs keep many in flight
+        concurrency = self.config.max_workers * 4 if self.config.parallel_processing else 1
+        
+        self.logger.info(
+            f"Running AI on {len(pending)} file(s) in batches of {self.config.ai_batch_size}, "
+            f"{concurrency} request(s) at a time"
+        )
+        stages = [results[i].pop("_ai_stage") for i in pending]
+        images = [stage.pop("ai_image") for stage in stages]
+        
+        if concurrency > 1:
+            responses = _run_async(self.ai_processor.extract_batch_async(
+                images,
+                batch_size=self.config.ai_batch_size,
+                concurrency=concurrency
+            ))
+        else:
+            responses = self.ai_processor.extract_batch(
+                images, batch_size=self.config.ai_batch_size
+            )
+        
+        for i, stage, (ai_data, ai_status) in zip(pending, stages, responses):
+            results[i] = self._finish_result(stage, ai_data, ai_status)
+        
+        return results
+    
+    @staticmethod
+    def _encode_for_ai(image, max_side: int) -> Optional[bytes]:
+        """
+        JPEG-encode an image for upload, shrinking its long edge to max_side
+        
+        Vision models gain nothing from larger inputs, and providers bill
+        by image area, so oversized screenshots only cost bytes and tokens.
+        
+        Args:
+            image: BGR image
+            max_side: Longest edge in pixels (0 keeps the original size)
+        
+        Returns:
+            JPEG bytes, or None if encoding failed
+        """
+        height, width = image.shape[:2]
+        longest = max(height, width)
+        
+        if max_side and longest > max_side:
+            scale = max_side / longest
+            image = cv2.resize(
+                image,
+                (max(1, round(width * scale)), max(1, round(height * scale))),
+                interpolation=cv2.INTER_AREA
+            )
+        
+        encoded, buffer = cv2.imencode('.jpg', image, _AI_JPEG_PARAMS)
+        return buffer.tobytes() if encoded else None
+    
+    @staticmethod
+    def _save_image(path: Path, image) -> bool:
+        """Write an enhanced image with fast compression settings for its format"""
+        params = _IMWRITE_PARAMS.get(path.suffix.lower(), [])
+        return cv2.imwrite(str(path), image, params)
+    
+    def _should_use_ai(self, has_order: bool, has_items: bool, ocr_conf: float) -> bool:
         """
         Determine if AI should be used based on OCR results
         
         Args:
-            extracted: Extracted data from OCR
+            has_order: Whether OCR found an order ID
+            has_items: Whether OCR found any items
             ocr_conf: OCR confidence score
         
         Returns:
@@ -210,13 +408,7 @@ class MeowzonExtractor(LoggerMixin):
         if ocr_conf < self.config.tesseract_confidence_threshold:
             return True
         
-        if not extracted.get('order_ids'):
-            return True
-        
-        if not extracted.get('items'):
-            return True
-        
-        return False
+        return not (has_order and has_items)
     
     def _merge_results(
         self,
@@ -233,21 +425,94 @@ class MeowzonExtractor(LoggerMixin):
         Returns:
             Merged data dictionary
         """
-        merged = {}
+        # Prefer AI data if available
+        return {
+            key: ai_data.get(key) or ocr_data.get(key) or []
+            for key in _MERGE_KEYS
+        }
+    
+    def _wait_for_plot(self, plot_future) -> Optional[str]:
+        """
+        Wait for the background plot render to finish
+        
+        Args:
+            plot_future: Future from submitting plot_statistics, or None
+        
+        Returns:
+            Path to the saved plot, or None if plotting was skipped or failed
+        """
+        if plot_future is None:
+            return None
+        
+        try:
+            return plot_future.result()
+        except Exception as e:
+            self.logger.warning(f"Failed to generate plots: {e}")
+            return None
+    
+    def _save_outputs(self, df, summary: Optional[dict], plot_future):
+        """
+        Write the results in the configured output format
         
-        for key in ocr_data.keys():
-            # Prefer AI data if available
-            ai_values = ai_data.get(key, [])
-            ocr_values = ocr_data.get(key, [])
+        Args:
+            df: Results dataframe
+            summary: Analytics summary, or None
+            plot_future: Future from submitting plot_statistics, or None
+        """
+        self.logger.info("Saving results...")
+        
+        if self.config.output_format == 'all':
+            saved_files = OutputHandler.save_all_formats(
+                df,
+                self.config.output_csv,
+                summary,
+                plot_future
+            )
+            self.logger.info(f"Saved {len(saved_files)} output files")
+            for f in saved_files:
+                self.logger.info(f"  📄 {f}")
             
-            if ai_values:
-                merged[key] = ai_values
-            elif ocr_values:
-                merged[key] = ocr_values
-            else:
-                merged[key] = []
+        else:
+            # Save single format
+            output_path = self.config.output_csv
+            
+            if self.config.output_format == 'csv':
+                OutputHandler.save_csv(df, output_path)
+            elif self.config.output_format == 'excel':
+                output_path = str(Path(output_path).with_suffix('.xlsx'))
+                OutputHandler.save_excel(df, output_path)
+            elif self.config.output_format == 'json':
+                output_path = str(Path(output_path).with_suffix('.json'))
+                OutputHandler.save_json(df, output_path)
+            elif self.config.output_format == 'html':
+                output_path = str(Path(output_path).with_suffix('.html'))
+                analytics_plot_path = self._wait_for_plot(plot_future)
+                OutputHandler.save_html_report(df, output_path, summary, analytics_plot_path)
+            
+            self.logger.info(f"Results saved: {output_path}")
+    
+    def _result_columns(self, results: List[Dict]) -> List[str]:
+        """
+        Ordered output columns for the configured result fields
         
-        return merged
+        Args:
+            results: List of result dictionaries
+        
+        Returns:
+            Column names, including 'Error' only if some file failed
+        """
+        columns = list(_RESULT_COLUMNS)
+        
+        if self.config.include_raw_text:
+            columns.append("Raw Tesseract Snippet")
+        
+        if self.config.include_debug_info:
+            columns.extend(["Cropped Image", "Processed Image", "Validation Issues"])
+        
+        if any("Error" in result for result in results):
+            columns.append("Error")
+        
+        return columns
     
     def process_files(self, file_paths: List[str]) -> List[Dict]:
         """
@@ -259,46 +524,84 @@ class MeowzonExtractor(LoggerMixin):
         Returns:
             List of result dictionaries
         """
+        # With batching or parallel workers, AI runs once OCR is done for
+        # every file so requests can be grouped and overlapped
+        defer_ai = self.ai_processor is not None and (
+            self.config.ai_batch_size > 1 or self.config.parallel_processing
+        )
+        
         if self.config.parallel_processing:
-            return self._process_parallel(file_paths)
+            results = self._process_parallel(file_paths, defer_ai)
         else:
-            return self._process_sequential(file_paths)
+            results = self._process_sequential(file_paths, defer_ai)
+        
+        if defer_ai:
+            results = self._run_batched_ai(results)
+        
+        return results
     
-    def _process_sequential(self, file_paths: List[str]) -> List[Dict]:
+    def _process_sequential(self, file_paths: List[str], defer_ai: bool = False) -> List[Dict]:
         """Process files sequentially with progress bar"""
         results = []
         
-        for file_path in tqdm(file_paths, desc="🐾 Processing", unit="file"):
-            try:
-                result = self.process_single_file(file_path)
-                results.append(result)
-                
-                # Log result
-                status_emoji = "✅" if result['Status'] == "Success" else \
-                              "⚠️" if result['Status'] == "Review Required" else "❌"
-                self.logger.info(
-                    f"{status_emoji} {result['File Name']}: {result['Status']} "
-                    f"(conf: {result['Tesseract Confidence (%)']:.1f}%)"
-                )
-                
-            except Exception as e:
-                self.logger.error(f"Error processing {Path(file_path).name}: {e}")
-                results.append({
-                    "File Name": Path(file_path).name,
-                    "Status": "Error",
-                    "Error": str(e)
-                })
+        try:
+            for file_path in tqdm(file_paths, desc="🐾 Processing", unit="file"):
+                try:
+                    result = self.process_single_file(file_path, defer_ai=defer_ai)
+                    results.append(result)
+                    
+                    # Log result
+                    status_emoji = "✅" if result['Status'] == "Success" else \
+                                  "⚠️" if result['Status'] == "Review Required" else "❌"
+                    self.logger.info(
+                        f"{status_emoji} {result['File Name']}: {result['Status']} "
+                        f"(conf: {result['Tesseract Confidence (%)']:.1f}%)"
+                    )
+                    
+                except Exception as e:
+                    self.logger.error(f"Error processing {Path(file_path).name}: {e}")
+                    results.append({
+                        "File Name": Path(file_path).name,
+                        "Status": "Error",
+                        "Error": str(e)
+                    })
+        finally:
+            # Crop OCR threads live for this run, like the parallel path's process pool
+            self.image_processor.close()
+        
+        return results
+    
+    def _process_parallel(self, file_paths: List[str], defer_ai: bool = False) -> List[Dict]:
+        """Process files in parallel worker processes"""
+        results = []
+        
+        # One OpenMP thread per Tesseract (workers inherit the environment at spawn);
+        # the worker processes already fill the cores, and nested threads only contend
+        set_omp_limit = "OMP_THREAD_LIMIT" not in os.environ
+        if set_omp_limit:
+            os.environ["OMP_THREAD_LIMIT"] = "1"
+        
+        try:
+            results = self._run_worker_pool(file_paths, defer_ai)
+        finally:
+            if set_omp_limit:
+                os.environ.pop("OMP_THREAD_LIMIT", None)
         
         return results
     
-    def _process_parallel(self, file_paths: List[str]) -> List[Dict]:
-        """Process files in parallel"""
+    def _run_worker_pool(self, file_paths: List[str], defer_ai: bool) -> List[Dict]:
+        """Submit files to a spawn-based process pool and collect their results"""
         results = []
         
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+        with ProcessPoolExecutor(
+            max_workers=self.config.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.config,)
+        ) as executor:
             # Submit all tasks
             future_to_file = {
-                executor.submit(self.process_single_file, fp): fp
+                executor.submit(_process_file_in_worker, fp, defer_ai): fp
                 for fp in file_paths
             }
             
@@ -340,14 +643,13 @@ class MeowzonExtractor(LoggerMixin):
         if self.config.ai_mode != 'never':
             self.logger.info(f"AI provider: {self.config.ai_provider}")
         
-        # Find all image files
-        input_path = Path(self.config.input_folder)
-        extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp'}
-        
-        file_paths = [
-            str(p) for p in input_path.iterdir()
-            if p.is_file() and p.suffix.lower() in extensions
-        ]
+        # Find all image files (scandir reuses the dirent type, no stat per entry)
+        with os.scandir(self.config.input_folder) as entries:
+            file_paths = [
+                entry.path for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+                and entry.is_file()
+            ]
         
         if not file_paths:
             self.logger.warning(f"No image files found in {self.config.input_folder}")
@@ -358,73 +660,65 @@ class MeowzonExtractor(LoggerMixin):
         # Process all files
         results = self.process_files(file_paths)
         
-        # Convert to DataFrame
+        # Convert to DataFrame with a fixed schema (no per-row column inference)
         import pandas as pd
-        df = pd.DataFrame(results)
+        df = pd.DataFrame.from_records(results, columns=self._result_columns(results))
+        df[_FLOAT_COLUMNS] = df[_FLOAT_COLUMNS].astype('float64')
+        df[_CATEGORY_COLUMNS] = df[_CATEGORY_COLUMNS].astype('category')
+        df['Status'] = df['Status'].astype(pd.CategoricalDtype(_STATUS_CATEGORIES))
+        
+        # Format output
+        df = format_output_dataframe(df)
+        
+        # Scan the shared columns once for duplicate detection and analytics
+        context = None
+        if self.config.enable_duplicate_detection or self.config.enable_analytics:
+            context = AnalyticsContext.from_frame(df)
         
         # Post-processing
         if self.config.enable_duplicate_detection:
             self.logger.info("Detecting duplicates...")
-            df = DuplicateDetector.find_duplicates(df)
-            duplicates = DuplicateDetector.get_duplicate_groups(df)
+            df = DuplicateDetector.find_duplicates(df, context=context)
+            duplicates = DuplicateDetector.get_duplicate_groups(df, context=context)
             if duplicates:
                 self.logger.warning(f"Found {len(duplicates)} duplicate order(s)")
         
-        # Format output
-        df = format_output_dataframe(df)
-        
         # Generate analytics
         summary = None
         analytics_plot_path = None
+        plot_executor = None
+        plot_future = None
         
         if self.config.enable_analytics:
             self.logger.info("Generating analytics...")
-            summary = OrderAnalytics.generate_summary(df)
+            summary = OrderAnalytics.generate_summary(df, context=context)
             
             # Print text summary
-            text_report = OrderAnalytics.generate_text_report(df, summary)
+            text_report = OrderAnalytics.generate_text_report(df, summary, context=context)
             print("\n" + text_report)
             
-            # Generate plots
+            # Render plots in a background process while outputs are saved
             if self.config.generate_plots:
-                try:
-                    analytics_plot_path = str(Path(self.config.output_csv).parent / "meowzon_analytics.png")
-                    OrderAnalytics.plot_statistics(df, analytics_plot_path)
-                    self.logger.info(f"Analytics plot saved: {analytics_plot_path}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to generate plots: {e}")
-        
-        # Save outputs
-        self.logger.info("Saving results...")
+                analytics_plot_path = str(Path(self.config.output_csv).parent / "meowzon_analytics.png")
+                plot_executor = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                plot_future = plot_executor.submit(
+                    OrderAnalytics.plot_statistics, df, analytics_plot_path
+                )
         
-        if self.config.output_format == 'all':
-            saved_files = OutputHandler.save_all_formats(
-                df,
-                self.config.output_csv,
-                summary,
-                analytics_plot_path
-            )
-            self.logger.info(f"Saved {len(saved_files)} output files")
-            for f in saved_files:
-                self.logger.info(f"  📄 {f}")
-            
-        else:
-            # Save single format
-            output_path = self.config.output_csv
+        # Save outputs; the plot process is shut down even if saving fails
+        try:
+            self._save_outputs(df, summary, plot_future)
             
-            if self.config.output_format == 'csv':
-                OutputHandler.save_csv(df, output_path)
-            elif self.config.output_format == 'excel':
-                output_path = str(Path(output_path).with_suffix('.xlsx'))
-                OutputHandler.save_excel(df, output_path)
-            elif self.config.output_format == 'json':
-                output_path = str(Path(output_path).with_suffix('.json'))
-                OutputHandler.save_json(df, output_path)
-            elif self.config.output_format == 'html':
-                output_path = str(Path(output_path).with_suffix('.html'))
-                OutputHandler.save_html_report(df, output_path, summary, analytics_plot_path)
-            
-            self.logger.info(f"Results saved: {output_path}")
+            if plot_executor:
+                analytics_plot_path = self._wait_for_plot(plot_future)
+                if analytics_plot_path:
+                    self.logger.info(f"Analytics plot saved: {analytics_plot_path}")
+        finally:
+            if plot_executor:
+                plot_executor.shutdown()
         
         self.logger.info("=" * 60)
         self.logger.info("✅ EXTRACTION COMPLETE!")
@@ -2,36 +2,69 @@
 Image preprocessing and cropping strategies
 """
 
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 import numpy as np
-import re
 from typing import Tuple, List, Dict, Optional
 
 from .config import ExtractorConfig
+from .data_extractor import DataExtractor
 from .logging_utils import LoggerMixin
 
 
+# Longest side of the image copy used for skew line detection
+SKEW_DETECT_MAX_SIDE = 800
+
+
+@functools.lru_cache(maxsize=1)
+def cuda_available() -> bool:
+    """True if OpenCV was built with CUDA and a device is present"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
 class ImageProcessor(LoggerMixin):
     """Handles image preprocessing and cropping strategies"""
     
     def __init__(self, config: ExtractorConfig):
         self.config = config
         self.crop_strategies = config.crop_strategies
+        
+        # OCR crops concurrently: each thread gets its own tesserocr API, and
+        # both tesserocr and the tesseract subprocess release the GIL while
+        # recognising. Not when files are already spread over worker
+        # processes, which keep every core busy
+        if config.parallel_processing:
+            self.crop_workers = 1
+        else:
+            self.crop_workers = min(len(self.crop_strategies), os.cpu_count() or 1)
+        self._crop_pool = None
     
-    def apply_crop(
+    def close(self):
+        """Shut down the crop OCR threads (recreated if crops are OCR'd again)"""
+        if self._crop_pool is not None:
+            self._crop_pool.shutdown()
+            self._crop_pool = None
+    
+    def _crop_bounds(
         self,
         image: np.ndarray,
         crop_params: Dict[str, float]
-    ) -> Optional[np.ndarray]:
+    ) -> Optional[Tuple[int, int, int, int]]:
         """
-        Apply crop parameters to image
+        Pixel bounds of a crop
         
         Args:
             image: Input image
             crop_params: Dict with top, bottom, left, right percentages
         
         Returns:
-            Cropped image or None if invalid crop
+            (start_y, end_y, start_x, end_x), or None if invalid crop
         """
         height, width = image.shape[:2]
         
@@ -51,8 +84,56 @@ class ImageProcessor(LoggerMixin):
             self.logger.warning("Cropped region too small")
             return None
         
+        return start_y, end_y, start_x, end_x
+    
+    def apply_crop(
+        self,
+        image: np.ndarray,
+        crop_params: Dict[str, float]
+    ) -> Optional[np.ndarray]:
+        """
+        Apply crop parameters to image
+        
+        Args:
+            image: Input image
+            crop_params: Dict with top, bottom, left, right percentages
+        
+        Returns:
+            Cropped image or None if invalid crop
+        """
+        bounds = self._crop_bounds(image, crop_params)
+        if bounds is None:
+            return None
+        
+        start_y, end_y, start_x, end_x = bounds
         return image[start_y:end_y, start_x:end_x]
     
+    def _ocr_in_order(self, ocr_function, images: List[np.ndarray]):
+        """
+        OCR images, yielding results in input order
+        
+        With crop_workers > 1 all images are submitted up front; otherwise each
+        is OCR'd only when the caller asks for its result. Closing the generator
+        cancels work that has not started yet.
+        """
+        if self.crop_workers <= 1 or len(images) <= 1:
+            for img in images:
+                yield ocr_function(img)
+            return
+        
+        if self._crop_pool is None:
+            self._crop_pool = ThreadPoolExecutor(
+                max_workers=self.crop_workers, thread_name_prefix="meowzon-crop"
+            )
+        
+        futures = [self._crop_pool.submit(ocr_function, img) for img in images]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+    
     def find_best_crop(
         self,
         image: np.ndarray,
@@ -84,30 +165,40 @@ class ImageProcessor(LoggerMixin):
         best_processed = processed
         
         # Calculate score (higher for having order ID)
-        score = conf + 100 if self._has_order_id(text) else conf
+        has_id = self._has_order_id(text)
+        score = conf + 100 if has_id else conf
         
         self.logger.debug(
             f"Full image: confidence={conf:.1f}%, "
-            f"order_id={self._has_order_id(text)}, score={score:.1f}"
+            f"order_id={has_id}, score={score:.1f}"
         )
         
         # Early exit if very confident
-        if conf >= threshold_confidence and self._has_order_id(text):
+        if conf >= threshold_confidence and has_id:
             return best_color, best_text, best_conf, best_processed, best_crop_params
         
-        # Try each cropping strategy
+        # Cut each distinct crop region once (identical bounds give identical OCR,
+        # which could never beat the earlier score)
+        height, width = image.shape[:2]
+        seen_bounds = {(0, height, 0, width)}
+        candidates = []
         for crop_dict in self.crop_strategies:
-            cropped = self.apply_crop(image, crop_dict)
-            
-            if cropped is None:
+            bounds = self._crop_bounds(image, crop_dict)
+            if bounds is None or bounds in seen_bounds:
                 continue
-            
-            text, conf, processed = ocr_function(cropped)
-            crop_score = conf + 100 if self._has_order_id(text) else conf
+            seen_bounds.add(bounds)
+            start_y, end_y, start_x, end_x = bounds
+            candidates.append((crop_dict, image[start_y:end_y, start_x:end_x]))
+        
+        # Try each cropping strategy, in order
+        ocr_results = self._ocr_in_order(ocr_function, [cropped for _, cropped in candidates])
+        for (crop_dict, cropped), (text, conf, processed) in zip(candidates, ocr_results):
+            has_id = self._has_order_id(text)
+            crop_score = conf + 100 if has_id else conf
             
             self.logger.debug(
                 f"{crop_dict['name']}: confidence={conf:.1f}%, "
-                f"order_id={self._has_order_id(text)}, score={crop_score:.1f}"
+                f"order_id={has_id}, score={crop_score:.1f}"
             )
             
             if crop_score > score:
@@ -120,9 +211,12 @@ class ImageProcessor(LoggerMixin):
                 best_crop_params = crop_dict
                 
                 # Early exit if very confident
-                if conf >= threshold_confidence and self._has_order_id(text):
+                if conf >= threshold_confidence and has_id:
                     break
         
+        # Cancel speculative OCR of crops after an early exit
+        ocr_results.close()
+        
         self.logger.info(
             f"Best crop: '{best_crop_name}' with confidence {best_conf:.1f}%"
         )
@@ -132,7 +226,7 @@ class ImageProcessor(LoggerMixin):
     @staticmethod
     def _has_order_id(text: str) -> bool:
         """Check if text contains Amazon order ID pattern"""
-        return bool(re.search(r'\d{3}-\d{7}-\d{7}', text))
+        return DataExtractor.ORDER_ID_PATTERN.search(text) is not None
     
     def enhance_for_ocr(self, image: np.ndarray) -> np.ndarray:
         """
@@ -150,16 +244,30 @@ class ImageProcessor(LoggerMixin):
         else:
             gray = image.copy()
         
-        # Denoise
-        denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-        
-        # Sharpen
-        kernel = np.array([[-1,-1,-1],
-                          [-1, 9,-1],
-                          [-1,-1,-1]])
-        sharpened = cv2.filter2D(denoised, -1, kernel)
-        
-        return sharpened
+        if self.config.aggressive_mode:
+            # Non-local means denoise + strong sharpen (slow; for noisy photos of screens)
+            denoised = self._denoise(gray)
+            kernel = np.array([[-1,-1,-1],
+                              [-1, 9,-1],
+                              [-1,-1,-1]])
+            return cv2.filter2D(denoised, -1, kernel)
+        
+        # Unsharp mask: screenshots are already clean, so denoising buys nothing
+        blur = cv2.GaussianBlur(gray, (0, 0), 1.0)
+        return cv2.addWeighted(gray, 1.5, blur, -0.5, 0)
+    
+    def _denoise(self, gray: np.ndarray) -> np.ndarray:
+        """Non-local means denoise, on the GPU when OpenCV has CUDA"""
+        if cuda_available():
+            try:
+                d_gray = cv2.cuda_GpuMat()
+                d_gray.upload(gray)
+                d_out = cv2.cuda.fastNlMeansDenoising(d_gray, 10, search_window=21, block_size=7)
+                return d_out.download()
+            except (AttributeError, cv2.error) as e:
+                self.logger.debug(f"CUDA denoise failed, using CPU: {e}")
+        
+        return cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
     
     def detect_and_correct_skew(self, image: np.ndarray) -> np.ndarray:
         """
@@ -177,26 +285,23 @@ class ImageProcessor(LoggerMixin):
         else:
             gray = image
         
+        # Detect on a downscaled copy; the angle is scale-invariant
+        scale = min(1.0, SKEW_DETECT_MAX_SIDE / max(gray.shape[:2]))
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
         # Edge detection
         edges = cv2.Canny(gray, 50, 150, apertureSize=3)
         
-        # Detect lines using Hough transform
-        lines = cv2.HoughLines(edges, 1, np.pi/180, 200)
+        # Detect lines using Hough transform (votes shrink with line length)
+        lines = cv2.HoughLines(edges, 1, np.pi/180, max(1, int(200 * scale)))
         
         if lines is None:
             return image
         
-        # Calculate average angle
-        angles = []
-        for line in lines[:10]:  # Use first 10 lines
-            rho, theta = line[0]
-            angle = (theta * 180 / np.pi) - 90
-            angles.append(angle)
-        
-        if not angles:
-            return image
-        
-        avg_angle = np.median(angles)
+        # Calculate average angle of the 10 strongest lines
+        angles = lines[:10, 0, 1] * (180 / np.pi) - 90
+        avg_angle = float(np.median(angles))
         
         # Only correct if skew is significant
         if abs(avg_angle) < 0.5:
@@ -234,11 +339,15 @@ class ImageProcessor(LoggerMixin):
         # Normalize
         normalized = cv2.normalize(gray, None, 0, 255, cv2.NORM_MINMAX)
         
-        # Adaptive threshold
+        # Adaptive threshold (the box mean uses an integral image, ~2.5x faster)
+        if self.config.background_removal_method == "gaussian":
+            method = cv2.ADAPTIVE_THRESH_GAUSSIAN_C
+        else:
+            method = cv2.ADAPTIVE_THRESH_MEAN_C
         binary = cv2.adaptiveThreshold(
             normalized,
             255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            method,
             cv2.THRESH_BINARY,
             11,
             2
@@ -5,10 +5,27 @@ Interactive review mode for correcting extractions
 import pandas as pd
 from pathlib import Path
 import cv2
-from typing import Optional
+from typing import Optional, Tuple
 
 from .logging_utils import LoggerMixin
 
+# Optional: header-only reads of image dimensions
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def _image_size(path: Path) -> Optional[Tuple[int, int]]:
+    """(width, height) from the image header without decoding, or None if unknown"""
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            return img.size
+    except Exception:
+        return None
+
 
 class InteractiveReviewer(LoggerMixin):
     """Interactive review system for low-confidence extractions"""
@@ -106,14 +123,21 @@ class InteractiveReviewer(LoggerMixin):
         try:
             import platform
             
-            # Try to open image
-            img = cv2.imread(str(image_path))
+            max_dimension = 800
+            
+            # Decode at half resolution (JPEG decodes scaled DCT blocks) only when
+            # the header says that still fills the window, so nothing is decoded twice
+            size = _image_size(image_path)
+            if size is not None and max(size) >= 2 * max_dimension:
+                flags = cv2.IMREAD_REDUCED_COLOR_2
+            else:
+                flags = cv2.IMREAD_COLOR
+            img = cv2.imread(str(image_path), flags)
             if img is None:
                 return
             
             # Resize if too large
             height, width = img.shape[:2]
-            max_dimension = 800
             
             if height > max_dimension or width > max_dimension:
                 scale = max_dimension / max(height, width)
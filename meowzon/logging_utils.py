@@ -2,11 +2,16 @@
 Logging utilities for Meowzon OCR Extractor
 """
 
+import atexit
+import functools
 import logging
+import logging.handlers
+import os
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class ColoredFormatter(logging.Formatter):
@@ -21,11 +26,103 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Whether stdout is a terminal does not change while the process runs
+        self._use_color = hasattr(sys.stdout, 'isatty') and sys.stdout.isatty()
+    
     def format(self, record):
-        if hasattr(sys.stdout, 'isatty') and sys.stdout.isatty():
-            color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-            record.levelname = f"{color}{record.levelname}{self.COLORS['RESET']}"
-        return super().format(record)
+        if not self._use_color:
+            return super().format(record)
+        
+        # Color only this handler's output; other handlers share the record
+        levelname = record.levelname
+        color = self.COLORS.get(levelname, self.COLORS['RESET'])
+        record.levelname = f"{color}{levelname}{self.COLORS['RESET']}"
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
+
+
+class BufferedFileHandler(logging.Handler):
+    """
+    File handler that batches whole records into large appends
+    
+    Formatted records collect in memory and go to the file in a single
+    append when the batch reaches buffer_size, when an ERROR arrives, when
+    flush() is called (the queue listener does so whenever its queue runs
+    empty) or on close. Each batch ends on a record boundary.
+    """
+    
+    def __init__(self, filename: str, buffer_size: int = 1 << 16):
+        super().__init__()
+        self.buffer_size = buffer_size
+        # Unbuffered: each flush is one write() of complete lines
+        self._file = open(filename, 'ab', buffering=0)
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+    
+    def emit(self, record):
+        try:
+            line = self.format(record) + '\n'
+            if os.linesep != '\n':
+                line = line.replace('\n', os.linesep)
+            data = line.encode('utf-8')
+        except Exception:
+            self.handleError(record)
+            return
+        
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= self.buffer_size or record.levelno >= logging.ERROR:
+            self.flush()
+    
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending and not self._file.closed:
+                self._file.write(b''.join(self._pending))
+                self._pending.clear()
+                self._pending_size = 0
+        finally:
+            self.release()
+    
+    def close(self):
+        self.acquire()
+        try:
+            self.flush()
+            self._file.close()
+        finally:
+            self.release()
+        super().close()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that flushes its handlers each time the queue is drained"""
+    
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+# Background listener that owns the file handler (one per process)
+_listener: Optional[_FlushingQueueListener] = None
+
+
+def _stop_listener():
+    """Drain queued records and close the file sink"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
 
 
 def setup_logging(
@@ -44,6 +141,7 @@ def setup_logging(
     Returns:
         Configured logger instance
     """
+    global _listener
     
     # Create logger
     logger = logging.getLogger('meowzon')
@@ -51,6 +149,7 @@ def setup_logging(
     
     # Remove existing handlers
     logger.handlers.clear()
+    _stop_listener()
     
     # Console handler with colors
     console_handler = logging.StreamHandler(sys.stdout)
@@ -68,14 +167,21 @@ def setup_logging(
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+        file_handler = BufferedFileHandler(log_file)
         file_handler.setLevel(logging.DEBUG)
         file_format = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
+        
+        # Callers only enqueue; a background thread does the file writes
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _listener = _FlushingQueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        _listener.start()
     
     # Prevent propagation to root logger
     logger.propagate = False
@@ -86,8 +192,12 @@ def setup_logging(
 class LoggerMixin:
     """Mixin to add logging capabilities to any class"""
     
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _cls_logger(cls) -> logging.Logger:
+        # One lookup per class, shared by all of its instances
+        return logging.getLogger(f'meowzon.{cls.__name__}')
+    
     @property
-    def logger(self):
-        if not hasattr(self, '_logger'):
-            self._logger = logging.getLogger(f'meowzon.{self.__class__.__name__}')
-        return self._logger
+    def logger(self) -> logging.Logger:
+        return type(self)._cls_logger()
@@ -0,0 +1,46 @@
+"""
+Persistent cache of Tesseract results keyed by the exact image passed to OCR
+"""
+
+import time
+from typing import Optional, Tuple
+
+from .cache_store import SQLiteStore
+
+
+class OCRResultCache(SQLiteStore):
+    """SQLite store of (text, confidence) per (OCR input digest, Tesseract settings)"""
+    
+    TABLE = "ocr_results"
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS ocr_results ("
+        "hash BLOB NOT NULL, settings TEXT NOT NULL, "
+        "text TEXT NOT NULL, confidence REAL NOT NULL, ts REAL NOT NULL, "
+        "PRIMARY KEY (hash, settings))"
+    )
+    LABEL = "OCR cache"
+    
+    def get(self, digest: bytes, settings: str) -> Optional[Tuple[str, float]]:
+        """
+        Look up a cached OCR result
+        
+        Args:
+            digest: Digest of the preprocessed image
+            settings: Tesseract version and config string
+        
+        Returns:
+            (text, confidence), or None on a miss
+        """
+        row = self._fetchone(
+            "SELECT text, confidence FROM ocr_results "
+            "WHERE hash = ? AND settings = ?",
+            (digest, settings)
+        )
+        return (row[0], row[1]) if row else None
+    
+    def put(self, digest: bytes, settings: str, text: str, confidence: float):
+        """Store an OCR result, replacing any earlier one"""
+        self._write(
+            "INSERT OR REPLACE INTO ocr_results VALUES (?, ?, ?, ?, ?)",
+            (digest, settings, text, float(confidence), time.time())
+        )
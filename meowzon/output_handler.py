@@ -2,13 +2,82 @@
 Output handling for multiple file formats
 """
 
+import functools
+import html
+import re
 import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
 from .logging_utils import LoggerMixin
 
+# Optional: streaming Excel writer
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+
+_SUMMARY_CARD = '''
+                <div class="summary-card">
+                    <h3>{}</h3>
+                    <div class="value">{}</div>
+                </div>
+                '''
+
+# Status keywords (whole words) and their coloured markup
+_STATUS_PATTERN = re.compile(r'\b(Success|Review|Failed)\b')
+_STATUS_SPANS = {
+    'Success': '<span class="status-success">Success</span>',
+    'Review': '<span class="status-review">Review</span>',
+    'Failed': '<span class="status-failed">Failed</span>',
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _status_html(value: str) -> str:
+    """Escape a status cell and colour its Success/Review/Failed keyword"""
+    return _STATUS_PATTERN.sub(lambda m: _STATUS_SPANS[m.group(1)], html.escape(value))
+
+
+def _html_table(df: pd.DataFrame) -> str:
+    """
+    Render a dataframe as an HTML table
+    
+    Cells are formatted a column at a time and status columns coloured as they
+    are written, rather than styling a df.to_html() dump afterwards.
+    
+    Args:
+        df: DataFrame to render
+    
+    Returns:
+        HTML <table> markup
+    """
+    columns = []
+    for name in df.columns:
+        col = df[name]
+        if col.dtype.kind == 'f':
+            # Same 6-digit display precision as df.to_html
+            col = col.round(6)
+        cells = col.astype(str).where(col.notna(), '-')
+        if str(name).endswith('Status'):
+            columns.append(cells.map(_status_html))
+        else:
+            columns.append(cells.map(html.escape))
+    
+    header = ''.join(f'<th>{html.escape(str(name))}</th>' for name in df.columns)
+    rows = '\n'.join(
+        '<tr><td>' + '</td><td>'.join(row) + '</td></tr>' for row in zip(*columns)
+    )
+    
+    return (
+        '<table border="1" class="dataframe data-table">\n'
+        f'<thead>\n<tr style="text-align: right;">{header}</tr>\n</thead>\n'
+        f'<tbody>\n{rows}\n</tbody>\n</table>'
+    )
+
 
 class OutputHandler(LoggerMixin):
     """Handle multiple output formats"""
@@ -20,19 +89,65 @@ class OutputHandler(LoggerMixin):
     
     @staticmethod
     def save_excel(df: pd.DataFrame, path: str):
-        """Save dataframe as formatted Excel file"""
+        """Save dataframe as formatted Excel file (xlsxwriter if installed, else openpyxl)"""
+        if xlsxwriter is not None:
+            OutputHandler._save_excel_xlsxwriter(df, path)
+        else:
+            OutputHandler._save_excel_openpyxl(df, path)
+    
+    @staticmethod
+    def _excel_column_widths(df: pd.DataFrame) -> list:
+        """Column widths fitted to the longest value (vectorised string lengths), capped at 50"""
+        widths = []
+        for col in df.columns:
+            lengths = df[col].astype(str).str.len()
+            max_length = max(lengths.max() if len(lengths) else 0, len(str(col)))
+            widths.append(min(max_length + 2, 50))
+        return widths
+    
+    @staticmethod
+    def _save_excel_xlsxwriter(df: pd.DataFrame, path: str):
+        """Stream rows to disk with xlsxwriter (constant memory, row order only)"""
+        # URLs and order text stay plain strings, as with openpyxl
+        options = {'constant_memory': True, 'strings_to_urls': False}
+        with xlsxwriter.Workbook(path, options) as workbook:
+            worksheet = workbook.add_worksheet('Orders')
+            
+            # Styled header row
+            header_format = workbook.add_format({
+                'bold': True,
+                'font_color': '#FFFFFF',
+                'bg_color': '#4472C4',
+                'align': 'center',
+                'valign': 'vcenter',
+            })
+            worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+            
+            # Python scalars with None for missing values (written as empty cells)
+            values = df.astype(object).where(df.notna(), None)
+            for row_idx, row in enumerate(values.itertuples(index=False, name=None), 1):
+                worksheet.write_row(row_idx, 0, row)
+            
+            # Auto-adjust column widths
+            for idx, width in enumerate(OutputHandler._excel_column_widths(df)):
+                worksheet.set_column(idx, idx, width)
+            
+            # Freeze header row
+            worksheet.freeze_panes(1, 0)
+    
+    @staticmethod
+    def _save_excel_openpyxl(df: pd.DataFrame, path: str):
+        """Write through pandas' openpyxl engine, then style the sheet"""
         try:
-            from openpyxl import load_workbook
             from openpyxl.styles import Font, Alignment, PatternFill
         except ImportError:
-            raise ImportError("openpyxl not installed. Run: pip install openpyxl")
+            raise ImportError("openpyxl not installed. Run: pip install xlsxwriter (or openpyxl)")
         
         # Write to Excel
         with pd.ExcelWriter(path, engine='openpyxl') as writer:
             df.to_excel(writer, index=False, sheet_name='Orders')
             
-            # Get workbook and worksheet
-            workbook = writer.book
+            # Get worksheet
             worksheet = writer.sheets['Orders']
             
             # Style header row
@@ -45,14 +160,9 @@ class OutputHandler(LoggerMixin):
                 cell.alignment = Alignment(horizontal='center', vertical='center')
             
             # Auto-adjust column widths
-            for idx, col in enumerate(df.columns, 1):
-                max_length = max(
-                    df[col].astype(str).apply(len).max(),
-                    len(col)
-                )
-                adjusted_width = min(max_length + 2, 50)  # Cap at 50
+            for idx, width in enumerate(OutputHandler._excel_column_widths(df), 1):
                 column_letter = worksheet.cell(row=1, column=idx).column_letter
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+                worksheet.column_dimensions[column_letter].width = width
             
             # Freeze header row
             worksheet.freeze_panes = 'A2'
@@ -207,13 +317,7 @@ class OutputHandler(LoggerMixin):
                 ('Unique Sellers', summary['unique_sellers']),
             ]
             
-            for title, value in cards:
-                html_parts.append(f'''
-                <div class="summary-card">
-                    <h3>{title}</h3>
-                    <div class="value">{value}</div>
-                </div>
-                ''')
+            html_parts.extend(_SUMMARY_CARD.format(title, value) for title, value in cards)
             
             html_parts.append('</div>')
         
@@ -229,26 +333,8 @@ class OutputHandler(LoggerMixin):
         # Data table
         html_parts.append('<h2>Extraction Results</h2>')
         
-        # Convert DataFrame to HTML with custom styling
-        df_html = df.to_html(
-            index=False,
-            classes='data-table',
-            escape=False,
-            na_rep='-'
-        )
-        
-        # Add status styling
-        df_html = df_html.replace(
-            'Success', '<span class="status-success">Success</span>'
-        )
-        df_html = df_html.replace(
-            'Review', '<span class="status-review">Review</span>'
-        )
-        df_html = df_html.replace(
-            'Failed', '<span class="status-failed">Failed</span>'
-        )
-        
-        html_parts.append(df_html)
+        # Status cells are coloured while the table is built
+        html_parts.append(_html_table(df))
         
         # Timestamp
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -274,7 +360,7 @@ class OutputHandler(LoggerMixin):
         df: pd.DataFrame,
         base_path: str,
         summary: Optional[dict] = None,
-        analytics_plot: Optional[str] = None
+        analytics_plot: Optional[Union[str, Future]] = None
     ):
         """
         Save dataframe in all supported formats
@@ -283,36 +369,42 @@ class OutputHandler(LoggerMixin):
             df: DataFrame to save
             base_path: Base path without extension
             summary: Summary statistics
-            analytics_plot: Path to analytics plot
+            analytics_plot: Path to analytics plot, or a Future resolving to it
+                while the plot is still rendering
         """
         base = Path(base_path).stem
         directory = Path(base_path).parent
         
-        formats = {
-            'csv': OutputHandler.save_csv,
-            'xlsx': OutputHandler.save_excel,
-            'json': OutputHandler.save_json,
-        }
+        def save_report(df: pd.DataFrame, path: str):
+            # HTML report needs the plot, so only this writer waits for it
+            plot = analytics_plot
+            if isinstance(plot, Future):
+                plot = plot.result() if plot.exception() is None else None
+            OutputHandler.save_html_report(df, path, summary, plot)
+        
+        formats = [
+            ('csv', OutputHandler.save_csv, directory / f"{base}.csv"),
+            ('xlsx', OutputHandler.save_excel, directory / f"{base}.xlsx"),
+            ('json', OutputHandler.save_json, directory / f"{base}.json"),
+            ('HTML report', save_report, directory / f"{base}_report.html"),
+        ]
+        
+        # Writers are independent; run them side by side (compression, native
+        # encoders and file writes release the GIL)
+        with ThreadPoolExecutor(max_workers=len(formats), thread_name_prefix="meowzon-save") as executor:
+            futures = [
+                (name, output_path, executor.submit(save_func, df, str(output_path)))
+                for name, save_func, output_path in formats
+            ]
         
         saved_files = []
         
-        for ext, save_func in formats.items():
+        for name, output_path, future in futures:
             try:
-                output_path = directory / f"{base}.{ext}"
-                save_func(df, str(output_path))
+                future.result()
                 saved_files.append(str(output_path))
             except Exception as e:
-                print(f"Warning: Failed to save {ext}: {e}")
-        
-        # HTML report
-        try:
-            html_path = directory / f"{base}_report.html"
-            OutputHandler.save_html_report(
-                df, str(html_path), summary, analytics_plot
-            )
-            saved_files.append(str(html_path))
-        except Exception as e:
-            print(f"Warning: Failed to save HTML report: {e}")
+                print(f"Warning: Failed to save {name}: {e}")
         
         return saved_files
 
@@ -46,6 +46,7 @@ setup(
             "openai>=1.0.0",
             "anthropic>=0.18.0",
             "google-generativeai>=0.3.0",
+            "httpx[http2]>=0.24.0",
         ],
         "analytics": [
             "matplotlib>=3.7.0",
@@ -53,14 +54,34 @@ setup(
         ],
         "excel": [
             "openpyxl>=3.1.0",
+            "xlsxwriter>=3.0.0",
+        ],
+        "speed": [
+            "numba>=0.58.0",
+            "polars>=0.20.0",
+            "pyarrow>=14.0.0",
+            "pybase64>=1.3.0",
+            "uvloop>=0.18.0; sys_platform != 'win32'",
+            "orjson>=3.9.0",
+            "blake3>=0.3.0",
+            "tesserocr>=2.6.0; sys_platform != 'win32'",
         ],
         "full": [
             "openai>=1.0.0",
             "anthropic>=0.18.0",
             "google-generativeai>=0.3.0",
+            "httpx[http2]>=0.24.0",
             "matplotlib>=3.7.0",
             "seaborn>=0.12.0",
             "openpyxl>=3.1.0",
+            "xlsxwriter>=3.0.0",
+            "numba>=0.58.0",
+            "polars>=0.20.0",
+            "pyarrow>=14.0.0",
+            "pybase64>=1.3.0",
+            "uvloop>=0.18.0; sys_platform != 'win32'",
+            "orjson>=3.9.0",
+            "blake3>=0.3.0",
         ],
     },
     entry_points={
@@ -5,6 +5,45 @@ Test script to verify Meowzon installation and dependencies
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _try_import(module):
+    """Return True if module imports"""
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def _try_import_concurrently(module):
+    """Like _try_import, but any error counts as a failure for the serial retry"""
+    try:
+        return _try_import(module)
+    except Exception:
+        # e.g. AttributeError from a dependency another thread is still initialising
+        return False
+
+
+def _probe_imports(modules):
+    """
+    Import modules concurrently so file reads and extension loading overlap
+    
+    Failures are re-checked one at a time: packages importing a shared
+    dependency from several threads can see it partially initialised.
+    
+    Returns:
+        Dict of module name -> importable
+    """
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = dict(zip(modules, executor.map(_try_import_concurrently, modules)))
+    
+    for module, ok in results.items():
+        if not ok:
+            results[module] = _try_import(module)
+    
+    return results
 
 
 def test_imports():
@@ -27,27 +66,38 @@ def test_imports():
         'google.generativeai': 'google-generativeai',
         'matplotlib': 'matplotlib',
         'openpyxl': 'openpyxl',
+        'xlsxwriter': 'xlsxwriter',
+        'numba': 'numba',
+        'polars': 'polars',
+        'pyarrow': 'pyarrow',
+        'pybase64': 'pybase64',
+        'uvloop': 'uvloop',
+        'orjson': 'orjson',
+        'blake3': 'blake3',
+        'tesserocr': 'tesserocr',
+        'httpx': 'httpx',
     }
     
     failed = []
     
+    # Import everything at once, then report in the usual order
+    importable = _probe_imports(list(required) + list(optional))
+    
     # Test required
     print("\n✓ Required packages:")
     for module, package in required.items():
-        try:
-            __import__(module)
+        if importable[module]:
             print(f"  ✓ {package}")
-        except ImportError:
+        else:
             print(f"  ✗ {package} - NOT INSTALLED")
             failed.append(package)
     
     # Test optional
-    print("\n✓ Optional packages (AI/Analytics):")
+    print("\n✓ Optional packages (AI/Analytics/Speed):")
     for module, package in optional.items():
-        try:
-            __import__(module)
+        if importable[module]:
             print(f"  ✓ {package}")
-        except ImportError:
+        else:
             print(f"  - {package} - not installed (optional)")
     
     return failed